@@ -0,0 +1,341 @@
+# epl_scraper/api_client.py
+
+import asyncio
+import atexit
+import logging
+import threading
+from datetime import datetime
+
+import httpx
+
+from .config import ScrapingConfig
+
+logger = logging.getLogger(__name__)
+
+# One keep-alive connection pool for the whole process, driven by a private
+# event loop thread so sync callers (including worker threads) can share it.
+_lock = threading.Lock()
+_loop = None
+_client = None
+
+
+class APIUnavailable(Exception):
+    """The JSON API refused or does not have a resource; fall back to Selenium."""
+
+
+def _event_link(event):
+    url = f"https://www.sofascore.com/football/match/{event['slug']}/{event['customId']}#id:{event['id']}"
+    return {'url': url, 'match_id': str(event['id'])}
+
+
+async def _get_json(client, path):
+    resp = await client.get(path)
+    if resp.status_code in (403, 404):
+        raise APIUnavailable(f"{resp.status_code} for {path}")
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def _season_id(client, season):
+    payload = await _get_json(client, f"/unique-tournament/{ScrapingConfig.TOURNAMENT_ID}/seasons")
+    for s in payload.get('seasons', []):
+        if s.get('year') == season:
+            return s['id']
+    raise APIUnavailable(f"Season {season} not listed by the API")
+
+
+async def _throttled(api, make_request):
+    """Awaits make_request() behind api's RateLimiter and CircuitBreaker, recording
+    its outcome. Both block, so they are waited on off the event loop.
+
+    The first APIUnavailable marks the API unavailable for the rest of the run:
+    later calls fail fast without a request, and none of it counts toward the
+    breaker, which the browser workers share.
+    """
+    if api.unavailable:
+        raise APIUnavailable("API already found unavailable this run")
+    if api.breaker is not None:
+        await asyncio.to_thread(api.breaker.wait_if_open)
+    if api.limiter is not None:
+        await asyncio.to_thread(api.limiter.acquire)
+    if api.unavailable:
+        raise APIUnavailable("API already found unavailable this run")
+    try:
+        result = await make_request()
+    except APIUnavailable:
+        api.unavailable = True
+        raise
+    except Exception:
+        if api.breaker is not None and api.breaker.record_failure():
+            logger.warning(f"{api.breaker.threshold} consecutive API failures, pausing for {api.breaker.cooldown}s.")
+        raise
+    if api.breaker is not None:
+        api.breaker.record_success()
+    return result
+
+
+def _run(func, *args):
+    global _loop, _client
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="sofascore-api", daemon=True).start()
+            _client = httpx.AsyncClient(
+                base_url=ScrapingConfig.API_BASE_URL,
+                headers=ScrapingConfig.API_HEADERS,
+                timeout=ScrapingConfig.API_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=ScrapingConfig.API_MAX_CONNECTIONS,
+                    max_keepalive_connections=ScrapingConfig.API_MAX_KEEPALIVE,
+                ),
+            )
+            atexit.register(close)
+    return asyncio.run_coroutine_threadsafe(func(_client, *args), _loop).result()
+
+
+def close():
+    global _loop, _client
+    with _lock:
+        if _loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(_client.aclose(), _loop).result(timeout=5)
+        except Exception as e:
+            logger.debug(f"Error closing API client: {e}")
+        _loop.call_soon_threadsafe(_loop.stop)
+        _loop, _client = None, None
+
+
+async def _fetch_rounds(client, season, matchdays, api):
+    season_id = await _throttled(api, lambda: _season_id(client, season))
+    base = f"/unique-tournament/{ScrapingConfig.TOURNAMENT_ID}/season/{season_id}/events/round"
+    sem = asyncio.Semaphore(ScrapingConfig.API_MAX_CONCURRENCY)
+
+    async def fetch_one(md):
+        async with sem:
+            return await _throttled(api, lambda: _get_json(client, f"{base}/{md}"))
+
+    results = await asyncio.gather(*(fetch_one(md) for md in matchdays), return_exceptions=True)
+
+    links = {}
+    for md, result in zip(matchdays, results):
+        if isinstance(result, Exception):
+            logger.warning(f"API lookup for round {md} failed: {result}")
+            continue
+        links[md] = _event_links(result.get('events', []), md)
+    return links
+
+
+def _event_links(events, md):
+    # One malformed event shouldn't cost the rest of its round
+    links = []
+    for event in events:
+        try:
+            links.append(_event_link(event))
+        except (KeyError, TypeError) as e:
+            logger.warning(f"Skipping malformed event in round {md}: missing {e}")
+    return links
+
+
+def fetch_rounds(season, matchdays, limiter=None, breaker=None):
+    """SofaScoreAPIClient.fetch_rounds on a one-off client."""
+    return SofaScoreAPIClient(limiter=limiter, breaker=breaker).fetch_rounds(season, matchdays)
+
+
+# --- Per-match endpoints ---
+STAT_PERIODS = {'ALL': 'overall', '1ST': 'first_half', '2ND': 'second_half'}
+
+
+async def _get_optional(client, path):
+    # Odds, votes and statistics are simply absent for some matches
+    try:
+        return await _get_json(client, path)
+    except (APIUnavailable, httpx.HTTPError) as e:
+        logger.debug(f"Optional API resource missing: {e}")
+        return None
+
+
+def _parse_date_time(event):
+    ts = event.get('startTimestamp')
+    if not ts:
+        return {'date_time': 'Not found', 'date': 'Not found', 'time': 'Not found'}
+    start = datetime.fromtimestamp(ts)
+    date, time_ = start.strftime('%d/%m/%Y'), start.strftime('%H:%M')
+    return {'date_time': f"{date} {time_}", 'date': date, 'time': time_}
+
+
+def _parse_venue(event):
+    venue = event.get('venue') or {}
+    name = (venue.get('stadium') or {}).get('name') or venue.get('name')
+    location = (venue.get('city') or {}).get('name')
+    return {'name': name or "N/A", 'location': location or "N/A"}
+
+
+def _parse_referee(event):
+    referee = event.get('referee') or {}
+    games = referee.get('games') or 0
+
+    def avg(key):
+        return str(round(referee.get(key, 0) / games, 2)) if games else "N/A"
+
+    return {
+        'name': referee.get('name') or "N/A",
+        'avg_red_cards': avg('redCards'),
+        'avg_yellow_cards': avg('yellowCards'),
+        'attendance': str(event['attendance']) if event.get('attendance') else "N/A",
+    }
+
+
+def _decimal_odds(fractional):
+    try:
+        num, den = fractional.split('/')
+        return f"{1 + int(num) / int(den):.2f}"
+    except (AttributeError, ValueError, ZeroDivisionError):
+        return "N/A"
+
+
+def _parse_odds(payload):
+    out = {'1': 'N/A', 'X': 'N/A', '2': 'N/A'}
+    for market in (payload or {}).get('markets', []):
+        if market.get('marketName') == 'Full time':
+            for choice in market.get('choices', []):
+                if choice.get('name') in out:
+                    out[choice['name']] = _decimal_odds(choice.get('fractionalValue'))
+            break
+    return out
+
+
+def _parse_votes(payload):
+    vote = (payload or {}).get('vote') or {}
+    counts = [vote.get('vote1'), vote.get('voteX'), vote.get('vote2')]
+    if any(c is None for c in counts) or not sum(counts):
+        return {'home': "N/A", 'draw': "N/A", 'away': "N/A", 'total_votes': "N/A"}
+    total = sum(counts)
+    home, draw, away = (round(100 * c / total) for c in counts)
+    return {'home': home, 'draw': draw, 'away': away, 'total_votes': str(total)}
+
+
+def _parse_statistics(payload):
+    out = {key: [] for key in STAT_PERIODS.values()}
+    for period in (payload or {}).get('statistics', []):
+        key = STAT_PERIODS.get(period.get('period'))
+        if key is None:
+            continue
+        out[key] = [
+            {'name': item.get('name', "N/A"), 'home_value': item.get('home', "N/A"), 'away_value': item.get('away', "N/A")}
+            for group in period.get('groups', [])
+            for item in group.get('statisticsItems', [])
+        ]
+    return out
+
+
+def _comment_minute(comment):
+    minute = comment.get('time')
+    if minute is None:
+        return "N/A"
+    added = comment.get('addedTime')
+    return f"{minute}+{added}'" if added else f"{minute}'"
+
+
+def _parse_comments(payload):
+    # Same order the page shows them in, newest first
+    return [
+        {'time': _comment_minute(c), 'text': c['text'].strip()}
+        for c in (payload or {}).get('comments', [])
+        if (c.get('text') or '').strip()
+    ]
+
+
+async def _fetch_comments(client, match_id):
+    return _parse_comments(await _get_json(client, f"/event/{match_id}/comments"))
+
+
+async def _fetch_match(client, match_id, matchday=None):
+    base = f"/event/{match_id}"
+    event, odds, votes, statistics = await asyncio.gather(
+        _get_json(client, base),
+        _get_optional(client, f"{base}/odds/1/all"),
+        _get_optional(client, f"{base}/votes"),
+        _get_optional(client, f"{base}/statistics"),
+    )
+    event = event.get('event') or {}
+    if matchday is None:
+        matchday = (event.get('roundInfo') or {}).get('round')
+    return {
+        'matchday': matchday,
+        'date_time_info': _parse_date_time(event),
+        'teams': {
+            'home_team': (event.get('homeTeam') or {}).get('name') or "N/A",
+            'away_team': (event.get('awayTeam') or {}).get('name') or "N/A",
+        },
+        'venue': _parse_venue(event),
+        'referee': _parse_referee(event),
+        'odds': _parse_odds(odds),
+        'crowd_voting': _parse_votes(votes),
+        'statistics': _parse_statistics(statistics),
+    }
+
+
+async def _fetch_matches(client, items, max_concurrency, api):
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def fetch_one(match_id, matchday):
+        async with sem:
+            return await _throttled(api, lambda: _fetch_match(client, match_id, matchday))
+
+    return await asyncio.gather(*(fetch_one(mid, md) for mid, md in items), return_exceptions=True)
+
+
+class SofaScoreAPIClient:
+    """Builds match data straight from the JSON API, in the same shape
+    SofaScoreEPLScraper.scrape_match produces from the rendered page.
+
+    fetch_rounds and scrape_round pace each request through the optional
+    RateLimiter and CircuitBreaker. Once the API refuses a resource they stop
+    calling it and set `unavailable`, so callers can go straight to the browser.
+    """
+
+    def __init__(self, limiter=None, breaker=None):
+        self.limiter = limiter
+        self.breaker = breaker
+        self.unavailable = False
+
+    def fetch_rounds(self, season, matchdays):
+        """Match links per matchday, at most API_MAX_CONCURRENCY rounds in flight.
+
+        Rounds the API could not serve are left out so the caller can fall back
+        to navigating them with Selenium.
+        """
+        matchdays = list(matchdays)
+        if not matchdays or self.unavailable:
+            return {}
+        try:
+            return _run(_fetch_rounds, season, matchdays, self)
+        except (APIUnavailable, httpx.HTTPError, ValueError, KeyError) as e:
+            # ValueError: a non-JSON body such as an HTML challenge page
+            logger.warning(f"SofaScore API unavailable, falling back to Selenium: {e}")
+            return {}
+
+    def scrape_match(self, match_id, matchday=None):
+        """Raises APIUnavailable or httpx.HTTPError if the event itself can't be fetched."""
+        return _run(_fetch_match, match_id, matchday)
+
+    def commentary(self, match_id):
+        """The match's full text commentary as {'time', 'text'} dicts, in one request.
+        Raises APIUnavailable or httpx.HTTPError like scrape_match."""
+        return _run(_fetch_comments, match_id)
+
+    def scrape_round(self, items, max_concurrency=ScrapingConfig.API_MAX_CONCURRENCY):
+        """Scrapes (match_id, matchday) pairs concurrently, at most max_concurrency
+        in flight. Returns results in input order, with None for failed matches."""
+        items = list(items)
+        if self.unavailable:
+            return [None] * len(items)
+        results = _run(_fetch_matches, items, max_concurrency, self) if items else []
+        out = []
+        for (mid, _), result in zip(items, results):
+            if isinstance(result, Exception):
+                logger.warning(f"API scrape failed for match {mid}: {result}")
+                result = None
+            out.append(result)
+        return out
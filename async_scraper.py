@@ -0,0 +1,214 @@
+# epl_scraper/async_scraper.py
+
+import asyncio
+import logging
+import sys
+
+from playwright.async_api import async_playwright, Error as PlaywrightError
+
+from .api_client import fetch_rounds
+from .config import ScrapingConfig, parse_card_stats, parse_percentage, parse_total_votes
+from .models import MatchRecord
+from .persistence import (
+    save_data_append, load_resume_ids, append_scraped_id,
+    load_round_links, save_round_links
+)
+from .throttle import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# Resolves once the stat rows' text differs from arg[1], i.e. a clicked tab has rendered
+_STATS_CHANGED_JS = "([sel, before]) => Array.from(document.querySelectorAll(sel), e => e.innerText).join('\\n') !== before"
+_STATS_TEXT_JS = "(sel) => Array.from(document.querySelectorAll(sel), e => e.innerText).join('\\n')"
+
+# Playwright evaluates arrow functions, while the shared snippets in
+# ScrapingConfig are execute_script bodies that read `arguments`.
+_APPLY_JS = "(args) => (function () {{ {body} }}).apply(null, args)"
+
+
+class AsyncSofaScoreScraper:
+    """Playwright port of SofaScoreEPLScraper.scrape_match.
+
+    All matches share one browser process; each gets its own lightweight
+    BrowserContext, so concurrency costs a tab rather than a whole Chrome.
+    """
+
+    def __init__(self, browser, timeout_ms=15000):
+        self.browser = browser
+        self.timeout_ms = timeout_ms
+
+    async def _run_js(self, page, body, *args):
+        return await page.evaluate(_APPLY_JS.format(body=body), list(args))
+
+    async def _block_heavy_resources(self, route):
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def scrape_match(self, url, matchday=None):
+        logger.info(f"Scraping match page: {url} (Matchday {matchday})")
+        context = await self.browser.new_context(
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+            viewport={"width": 1920, "height": 1080},
+        )
+        await context.route("**/*", self._block_heavy_resources)
+        page = await context.new_page()
+        page.set_default_timeout(self.timeout_ms)
+        try:
+            await page.goto(url, wait_until="domcontentloaded")
+            await page.wait_for_selector(ScrapingConfig.MATCH_DATE_TIME_CONTAINER, state="attached")
+
+            snapshot = await self._run_js(
+                page, ScrapingConfig.BATCH_EXTRACT_JS, ScrapingConfig.BATCH_EXTRACT_SELECTORS,
+                ['date_time', 'teams', 'venue', 'referee', 'odds', 'crowd_voting'])
+            data = {
+                'matchday': matchday,
+                'date_time_info': self._date_time_from_snapshot(snapshot),
+                'teams': self._teams_from_snapshot(snapshot),
+                'venue': {
+                    'name': snapshot.get('venue_name') or "N/A",
+                    'location': snapshot.get('venue_location') or "N/A",
+                },
+                'referee': self._referee_from_snapshot(snapshot),
+                'odds': self._odds_from_snapshot(snapshot),
+                'crowd_voting': self._crowd_voting_from_snapshot(snapshot),
+                'statistics': await self._get_stats(page),
+            }
+            logger.info(f"Scraping complete for {url} (Matchday {matchday})")
+            return data
+        except PlaywrightError as e:
+            logger.error(f"Failed to scrape {url}: {e}")
+            return {}
+        finally:
+            await context.close()
+
+    def _date_time_from_snapshot(self, snapshot):
+        dt = snapshot.get('date_time') or []
+        if len(dt) >= 2:
+            return {'date_time': f"{dt[0]} {dt[1]}", 'date': dt[0], 'time': dt[1]}
+        return {'date_time': 'Not found', 'date': 'Not found', 'time': 'Not found'}
+
+    def _teams_from_snapshot(self, snapshot):
+        names = snapshot.get('teams') or []
+        return {
+            'home_team': names[0] if len(names) > 0 else "N/A",
+            'away_team': names[1] if len(names) > 1 else "N/A",
+        }
+
+    def _referee_from_snapshot(self, snapshot):
+        red_cards, yellow_cards = parse_card_stats(snapshot.get('card_text') or "")
+        return {
+            "name": snapshot.get('referee') or "N/A",
+            "avg_red_cards": str(red_cards) if red_cards is not None else "N/A",
+            "avg_yellow_cards": str(yellow_cards) if yellow_cards is not None else "N/A",
+            "attendance": snapshot.get('attendance') or "N/A",
+        }
+
+    def _odds_from_snapshot(self, snapshot):
+        odds = snapshot.get('odds') or []
+        if len(odds) < 3:
+            return {'1': 'N/A', 'X': 'N/A', '2': 'N/A'}
+        return dict(zip(('1', 'X', '2'), odds[:3]))
+
+    def _crowd_voting_from_snapshot(self, snapshot):
+        out = {"home": "N/A", "draw": "N/A", "away": "N/A", "total_votes": "N/A"}
+        voting = snapshot.get('crowd_voting')
+        if not voting:
+            return out
+        percents = voting.get('percents') or []
+        if len(percents) >= 3:
+            out['home'], out['draw'], out['away'] = (parse_percentage(p) for p in percents[:3])
+        if voting.get('total_votes'):
+            out['total_votes'] = parse_total_votes(voting['total_votes'])
+        return out
+
+    async def _read_stats(self, page):
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2)")
+        try:
+            await page.wait_for_selector(ScrapingConfig.STAT_ROW, state="attached")
+        except PlaywrightError:
+            return []
+        snapshot = await self._run_js(
+            page, ScrapingConfig.BATCH_EXTRACT_JS, ScrapingConfig.BATCH_EXTRACT_SELECTORS, ['stats'])
+        return snapshot.get('stats') or []
+
+    async def _get_stats(self, page):
+        out = {"overall": await self._read_stats(page), "first_half": [], "second_half": []}
+        for tab_id, key in ((2, "first_half"), (3, "second_half")):
+            tab = await page.query_selector(f"div[data-tabid='{tab_id}']")
+            if not tab:
+                continue
+            before = await page.evaluate(_STATS_TEXT_JS, ScrapingConfig.STAT_ROW)
+            await tab.click()
+            try:
+                # The previous tab's rows are still attached until the new ones render
+                await page.wait_for_function(_STATS_CHANGED_JS, arg=[ScrapingConfig.STAT_ROW, before])
+            except PlaywrightError:
+                logger.warning(f"Stats did not change after selecting tab {tab_id}; skipping {key}.")
+                continue
+            out[key] = await self._read_stats(page)
+        return out
+
+
+async def async_main(start_matchday=1, end_matchday=38, season="24/25", headless=True,
+                     max_concurrency=ScrapingConfig.MAX_CONCURRENCY):
+    scraped_ids = load_resume_ids()
+
+    cached = load_round_links(season)
+    matchdays = range(start_matchday, end_matchday + 1)
+    missing = [md for md in matchdays if not cached.get(str(md))]
+    api_limiter = RateLimiter(ScrapingConfig.API_REQUESTS_PER_SECOND, burst=ScrapingConfig.API_MAX_CONCURRENCY)
+    for md, links in (await asyncio.to_thread(fetch_rounds, season, missing, api_limiter)).items():
+        cached[str(md)] = links
+    save_round_links(season, cached)
+
+    pending = []
+    queued = set(scraped_ids)
+    for md in matchdays:
+        links = cached.get(str(md))
+        if not links:
+            logger.error(f"No links for matchday {md}; run the Selenium runner to discover it.")
+            continue
+        for link in links:
+            if link['match_id'] not in queued:
+                queued.add(link['match_id'])
+                pending.append((md, link))
+    logger.info(f"Queued {len(pending)} matches, {max_concurrency} at a time.")
+
+    limiter = RateLimiter(ScrapingConfig.REQUESTS_PER_SECOND, burst=ScrapingConfig.RATE_LIMIT_BURST)
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        scraper = AsyncSofaScoreScraper(browser)
+
+        async def scrape_one(md, link):
+            mid = link['match_id']
+            try:
+                async with sem:
+                    await asyncio.to_thread(limiter.acquire)
+                    data = await scraper.scrape_match(link['url'], matchday=md)
+            except Exception as e:
+                logger.exception(f"Unexpected error scraping match {mid}: {e}")
+                data = None
+            if not data:
+                logger.error(f"Failed to scrape match {mid}.")
+                return
+            data['match_id'] = sys.intern(mid)
+            data['source_url'] = link['url']
+            save_data_append(MatchRecord.from_dict(data))
+            scraped_ids.add(mid)
+            append_scraped_id(mid)
+
+        try:
+            await asyncio.gather(*(scrape_one(md, link) for md, link in pending))
+        finally:
+            await browser.close()
+    logger.info("Async scraper finished.")
+
+
+if __name__ == "__main__":
+    asyncio.run(async_main())
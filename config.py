@@ -1,6 +1,22 @@
 # epl_scraper/config.py
 
+import functools
+import os
+import re
+import tempfile
+
 JSON_FILE_PATH = 'epl_matches_.json'
+JSONL_FILE_PATH = 'epl_matches_.jsonl'
+SCRAPED_IDS_PATH = 'scraped_ids.txt'
+ROUND_LINKS_PATH = 'round_links.json'
+STATS_PARQUET_PATH = 'epl_stats.parquet'
+# Chrome profiles persist here between runs so the HTTP and code caches stay warm
+CHROME_PROFILE_DIR = os.path.join(tempfile.gettempdir(), 'sofa-profile')
+
+_CARD_RE = re.compile(r'Avg\.\s*cards.?(\d+\.?\d)[^\d](\d+\.?\d)', re.IGNORECASE | re.DOTALL)
+_DECIMAL_RE = re.compile(r'\d+\.\d+')
+_PCT_RE = re.compile(r'(\d+)%')
+_VOTES_RE = re.compile(r"Total votes[:\s]*([\d.,]+)([kM]?)", re.IGNORECASE)
 
 class ScrapingConfig:
     # Timing & retry
@@ -11,6 +27,45 @@ class ScrapingConfig:
     BASE_RETRY_DELAY = 2
     TAB_OPEN_WAIT = 1
     SCROLL_TO_END_TIMEOUT = 30
+    NETWORK_IDLE_MS = 500
+    PAGE_READY_POLL = 0.1
+    COOKIE_BANNER_WAIT = 3
+
+    # Concurrency & politeness
+    MAX_CONCURRENCY = 4
+    REQUESTS_PER_SECOND = 0.5
+    RATE_LIMIT_BURST = 1
+    DRIVER_RECYCLE_AFTER = 50
+    SNAPSHOT_FLUSH_EVERY = 20
+    CIRCUIT_BREAKER_FAIL_THRESHOLD = 5
+    CIRCUIT_BREAKER_COOLDOWN = 60
+
+    # Set to a port (e.g. 9222) to keep Chrome running between runs and attach
+    # to it over the DevTools protocol; pooled drivers use consecutive ports.
+    REMOTE_DEBUGGING_PORT = None
+    CHROME_BINARY = "google-chrome"
+    CHROME_START_TIMEOUT = 10
+
+    # SofaScore JSON API
+    USE_API = True
+    API_BASE_URL = "https://api.sofascore.com/api/v1"
+    API_TIMEOUT = 10.0
+    API_MAX_KEEPALIVE = 20
+    API_MAX_CONNECTIONS = 16
+    API_MAX_CONCURRENCY = 8
+    # The API gets its own token bucket, sized so API_MAX_CONCURRENCY requests can be in flight
+    API_REQUESTS_PER_SECOND = 8
+    API_HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
+    TOURNAMENT_ID = 17
+
+    # Resources the scraper never reads; blocked at the driver to cut page weight
+    BLOCKED_URL_PATTERNS = [
+        "*.png", "*.jpg", "*.jpeg", "*.webp", "*.gif",
+        "*.svg", "*.ico", "*.avif", "*.woff", "*.woff2", "*.ttf", "*.otf",
+        "*.mp4", "*.webm", "*.mp3",
+        "*sofascore.com/static/img/*", "*img.sofascore.com/*",
+        "*analytics*", "*doubleclick*", "*googletagmanager*", "*googlesyndication*",
+    ]
 
     # Season/Round selectors
     SEASON_DROPDOWN_SELECTOR = 'div.Dropdown.kdhXwd button.DropdownButton.jQruaf'
@@ -65,6 +120,8 @@ class ScrapingConfig:
     
     # Crowd voting selectors - Updated based on HTML
     CROWD_VOTING_CONTAINER = "//span[text()='Who will win?']/ancestor::div[contains(@class, 'jTWvec')]"
+    CROWD_VOTING_SECTION_XPATH = "//span[contains(text(), 'Who will win?')]/ancestor::div[contains(@class, 'bg_surface')]"
+    VOTE_PERCENT_SELECTOR = "div.Text.gHLcGU"
     HOME_VOTE_PERCENTAGE = "(//div[@class='Text gHLcGU'])[1]"
     DRAW_VOTE_PERCENTAGE = "(//div[@class='Text gHLcGU'])[2]"
     AWAY_VOTE_PERCENTAGE = "(//div[@class='Text gHLcGU'])[3]"
@@ -87,6 +144,9 @@ class ScrapingConfig:
     STAT_ROW = "div.Box.Flex.heNsMA.bnpRyo"
     STAT_NAME = "span.Text.lluFbU"
     STAT_VALUE = "span.Text"
+    STAT_NAME_ANY = "span.Text.lluFbU, span.Text.eSKwCR, span.Text.llXWMP"
+    STAT_HOME_VALUE = "bdi.Box.iQnHnj span.Text"
+    STAT_AWAY_VALUE = "bdi.Box.fdyVPU span.Text"
     FIRST_HALF_TAB = "div[data-tabid='2']"
     SECOND_HALF_TAB = "div[data-tabid='3']"
 
@@ -104,6 +164,9 @@ class ScrapingConfig:
         r'\d{1,2}:\d{2}:\d{2}',
         r'\d{1,2}\.\d{2}',
     ]
+    # One scan to tell whether any date pattern is present at all; which one
+    # wins is still decided by DATE_PATTERNS order in the parser.
+    COMBINED_DATE_RE = re.compile('|'.join(f'(?:{p})' for p in DATE_PATTERNS))
     CALENDAR_ICONS = [
         "svg.SvgWrapper",
         "svg[viewBox='0 0 24 24'] path[d^='M22,2 L22,12.11']",
@@ -145,60 +208,310 @@ class ScrapingConfig:
     COMMENTARY_EVENT_TYPE_SPAN = "span.bGAxYH.fdnFeu"
     COMMENTARY_TEXT_SPAN = "span.gnTBMP.fdnFeu"
     COMMENTARY_SUB_PLAYER_SPAN = "span.gnTBMP.fdnFeu"
+    # Fallback entry containers for older layouts, tried in order
+    COMMENTARY_ALT_CONTAINERS = [
+        "div[class*='commentary-entry']",
+        "div[class*='event-entry']",
+        "div[class*='match-event']",
+        "div.d_flex.ai_center",
+        "div[class*='timeline-entry']"
+    ]
+    COMMENTARY_KEYWORDS = ['goal', 'card', 'corner', 'foul', 'attempt']
+    LOAD_MORE_WAIT_MS = 3000
+    # Tried in order inside each entry; the first usable hit wins
+    COMMENTARY_TIME_SELECTORS = [
+        "span.textStyle_assistive.default",
+        "span[class*='time']",
+        "span[class*='minute']",
+        "div[class*='time']",
+        ".time",
+        ".minute"
+    ]
+    COMMENTARY_TEXT_SELECTORS = [
+        "span.textStyle_body.small",
+        "span[class*='text']",
+        "div[class*='description']",
+        "span[class*='body']",
+        ".text",
+        ".description"
+    ]
 
-    # Add new load more selector for the Sofascore button
+    # "Show more" controls are found by their label first (a JS regex over
+    # button and link text), then by these CSS selectors
+    LOAD_MORE_TEXT_PATTERN = "show more|load more|view more"
     LOAD_MORE_SELECTORS = [
-        "//button[contains(., 'Show more')]",
-        "//button[contains(., 'Load more')]",
-        "//button[contains(., 'View more')]",
-        "//a[contains(., 'Show more')]",
         "button[class*='load-more']",
         "button[class*='show-more']",
         "button.ervFBh"
     ]
+
+    # Document ready state plus how many resources (including XHR/fetch) have
+    # finished loading; the page is idle once the count stops moving. The
+    # resource timing buffer stops at 250 entries, so each poll moves its
+    # entries into a running total on window and clears it.
+    PAGE_STATE_JS = """
+        window.__sofaResources = (window.__sofaResources || 0) + performance.getEntriesByType('resource').length;
+        performance.clearResourceTimings();
+        return [document.readyState, window.__sofaResources];
+    """
+
+    # Reads one property (or attribute) of every element matching a CSS
+    # selector in a single round-trip: arguments[0] = selector, arguments[1] = property.
+    CSS_QUERY_JS = """
+        const sel = arguments[0], prop = arguments[1];
+        return Array.from(document.querySelectorAll(sel), e => {
+            const v = prop in e ? e[prop] : e.getAttribute(prop);
+            return typeof v === 'string' ? v.trim() : v;
+        });
+    """
+
+    # Scrolls arguments[0] (the document when null) to its bottom until its
+    # scrollHeight has been stable for a few ticks or arguments[1] scrolls have
+    # happened, all in-page; the async callback fires with the number of scrolls taken.
+    SCROLL_CONTAINER_JS = """
+        const el = arguments[0] || document.scrollingElement, maxScrolls = arguments[1];
+        const done = arguments[arguments.length - 1];
+        let last = el.scrollHeight, stable = 0, scrolls = 0;
+        (function step() {
+            el.scrollTop = el.scrollHeight;
+            if (el.scrollHeight === last) {
+                if (++stable > 2) return done(scrolls);
+            } else {
+                stable = 0;
+                last = el.scrollHeight;
+                if (++scrolls >= maxScrolls) return done(scrolls);
+            }
+            setTimeout(step, 150);
+        })();
+    """
+
+    # Clicks the first displayed "Show more" control in one call: a button or
+    # link whose text matches arguments[1], else the first of arguments[0]
+    # (LOAD_MORE_SELECTORS). Returns what was clicked, or null.
+    LOAD_MORE_CLICK_JS = """
+        const selectors = arguments[0], label = new RegExp(arguments[1], 'i');
+        // Rendered, enabled and not collapsed to zero width
+        const usable = el => el && el.offsetParent !== null && !el.disabled
+            && el.getBoundingClientRect().width > 0;
+        const byText = Array.from(document.querySelectorAll('button, a'))
+            .find(el => usable(el) && label.test(el.innerText));
+        if (byText) {
+            byText.click();
+            return byText.innerText.trim();
+        }
+        for (const s of selectors) {
+            const el = document.querySelector(s);
+            if (usable(el)) {
+                el.click();
+                return s;
+            }
+        }
+        return null;
+    """
+
+    # Async: resolves true once more than arguments[1] elements match
+    # arguments[0], or false after arguments[2] ms. When nothing matches yet
+    # (older layouts), any inserted node counts as progress.
+    WAIT_FOR_MORE_JS = """
+        const sel = arguments[0], previous = arguments[1], timeoutMs = arguments[2];
+        const done = arguments[arguments.length - 1];
+        const count = () => document.querySelectorAll(sel).length;
+        if (count() > previous) return done(true);
+        const watchAny = count() === 0;
+        const finish = result => { obs.disconnect(); clearTimeout(timer); done(result); };
+        const obs = new MutationObserver(mutations => {
+            if (count() > previous || (watchAny && mutations.some(m => m.addedNodes.length))) finish(true);
+        });
+        obs.observe(document.body, {childList: true, subtree: true});
+        const timer = setTimeout(() => finish(false), timeoutMs);
+    """
+
+    # Finds the commentary entry elements in one call, mirroring
+    # get_commentary_containers: the primary selector if it matches, else the
+    # first alternative with entries that look like commentary.
+    # arguments[0] = primary, [1] = alternatives, [2] = keywords.
+    COMMENTARY_CONTAINERS_JS = """
+        const primary = arguments[0], alternatives = arguments[1], keywords = arguments[2];
+        const found = document.querySelectorAll(primary);
+        if (found.length) return Array.from(found);
+        const looksLike = e => {
+            const t = (e.innerText || e.textContent || '').trim();
+            const lower = t.toLowerCase();
+            return t.length > 5 && (/\\d/.test(t) || keywords.some(k => lower.indexOf(k) !== -1));
+        };
+        let last = [];
+        for (const s of alternatives) {
+            last = Array.from(document.querySelectorAll(s));
+            const matching = last.filter(looksLike);
+            if (matching.length) return matching;
+        }
+        return last;
+    """
+
+    # Reads {time, text} from every commentary entry element in one call, the
+    # in-page twin of extract_time_from_entry/extract_text_from_entry:
+    # arguments[0] = entry elements, [1] = time selectors, [2] = text selectors.
+    COMMENTARY_EXTRACT_JS = """
+        const entries = arguments[0], timeSels = arguments[1], textSels = arguments[2];
+        const text = e => (e.innerText || e.textContent || '').trim();
+        const firstHit = (entry, sels, ok) => {
+            for (const s of sels) {
+                const el = entry.querySelector(s);
+                if (el && ok(text(el))) return text(el);
+            }
+            return null;
+        };
+        return Array.from(entries, entry => {
+            const full = text(entry);
+            let time = firstHit(entry, timeSels, t => t.indexOf("'") !== -1);
+            if (!time) {
+                const m = full.match(/(\\d{1,3}(?:\\+\\d+)?)'/);
+                time = m ? m[1] + "'" : 'N/A';
+            }
+            let body = firstHit(entry, textSels, t => t.length > 3);
+            if (!body) body = full ? (full.replace(/^\\d{1,3}(?:\\+\\d+)?'\\s*/, '') || full) : 'N/A';
+            return {time: time, text: body};
+        });
+    """
+
+    # One page of parsed commentary: finds the entries like
+    # COMMENTARY_CONTAINERS_JS and reads [start, start + size) of them like
+    # COMMENTARY_EXTRACT_JS, so no element references leave the page.
+    # arguments = primary, alternatives, keywords, time sels, text sels, start, size.
+    COMMENTARY_CHUNK_JS = """
+        const [primary, alternatives, keywords, timeSels, textSels, start, size] = arguments;
+        const entries = (function () { %s }).apply(null, [primary, alternatives, keywords]);
+        return (function () { %s }).apply(null, [entries.slice(start, start + size), timeSels, textSels]);
+    """ % (COMMENTARY_CONTAINERS_JS, COMMENTARY_EXTRACT_JS)
+
+    # Batched DOM extraction: everything is read in-page by one execute_script.
+    # arguments[0] is BATCH_EXTRACT_SELECTORS, arguments[1] an optional list of
+    # field groups to read (all groups when omitted). Compiled XPath expressions
+    # are cached on the page's window, so repeated calls on one document skip
+    # re-parsing them.
+    BATCH_EXTRACT_SELECTORS = {
+        'date_time': MATCH_DATE_TIME_CONTAINER,
+        'team': TEAM_SELECTOR,
+        'venue_name': VENUE_NAME_XPATH,
+        'venue_location': VENUE_LOCATION_XPATH,
+        'attendance': ATTENDANCE_XPATH,
+        'referee': REFEREE_NAME_XPATH,
+        'card_stats': REFEREE_CARD_STATS_XPATH,
+        'surface_block': VENUE_SECTION_ALT,
+        'odds': ODDS_SELECTOR,
+        'stat_row': STAT_ROW,
+        'stat_name': STAT_NAME_ANY,
+        'stat_home': STAT_HOME_VALUE,
+        'stat_away': STAT_AWAY_VALUE,
+        'voting_block': CROWD_VOTING_SECTION_XPATH,
+        'vote_percent': VOTE_PERCENT_SELECTOR,
+        'commentary_entry': COMMENTARY_ENTRY_CONTAINER,
+        'commentary_time': COMMENTARY_TIME_SPAN,
+        'commentary_text': COMMENTARY_TEXT_SPAN,
+    }
+    BATCH_EXTRACT_JS = """
+        const sel = arguments[0], fields = arguments[1] || null;
+        const want = k => !fields || fields.indexOf(k) !== -1;
+        const text = e => e ? (e.innerText || e.textContent || '').trim() : null;
+        const cache = window.__sofaXPathCache || (window.__sofaXPathCache = new Map());
+        const byXPath = xp => {
+            let expr = cache.get(xp);
+            if (!expr) {
+                expr = document.createExpression(xp, null);
+                cache.set(xp, expr);
+            }
+            return expr.evaluate(document, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        };
+        const out = {};
+        if (want('date_time')) {
+            const cnt = document.querySelector(sel.date_time);
+            const spans = cnt ? cnt.querySelectorAll('span') : [];
+            out.date_time = spans.length >= 2 ? text(spans[1]).split('\\n') : [];
+        }
+        if (want('teams')) {
+            out.teams = Array.from(document.querySelectorAll(sel.team), e => (e.getAttribute('alt') || '').trim());
+        }
+        if (want('venue')) {
+            out.venue_name = text(byXPath(sel.venue_name));
+            out.venue_location = text(byXPath(sel.venue_location));
+        }
+        if (want('referee')) {
+            out.referee = text(byXPath(sel.referee));
+            out.attendance = text(byXPath(sel.attendance));
+            const cards = byXPath(sel.card_stats);
+            out.card_text = cards ? text(cards.closest(sel.surface_block) || cards.parentElement) : null;
+        }
+        if (want('odds')) {
+            out.odds = Array.from(document.querySelectorAll(sel.odds), text);
+        }
+        if (want('crowd_voting')) {
+            const block = byXPath(sel.voting_block);
+            const votes = block && Array.from(block.querySelectorAll('span'))
+                .find(s => (s.textContent || '').indexOf('Total votes') !== -1);
+            out.crowd_voting = block ? {
+                percents: Array.from(block.querySelectorAll(sel.vote_percent), text),
+                total_votes: text(votes),
+            } : null;
+        }
+        if (want('stats')) {
+            out.stats = Array.from(document.querySelectorAll(sel.stat_row), row => ({
+                name: text(row.querySelector(sel.stat_name)) || 'N/A',
+                home_value: text(row.querySelector(sel.stat_home)) || 'N/A',
+                away_value: text(row.querySelector(sel.stat_away)) || 'N/A',
+            }));
+        }
+        if (want('commentary')) {
+            out.commentary = Array.from(document.querySelectorAll(sel.commentary_entry), e => ({
+                time: text(e.querySelector(sel.commentary_time)),
+                text: text(e.querySelector(sel.commentary_text)),
+            }));
+        }
+        return out;
+    """
     
     def __init__(self, driver, config):
         self.driver = driver
         self.config = config
         self.logger = ...
 
-    # Helper function to extract card statistics from text
-    def extract_card_stats(text):
-        """Extract red and yellow card averages from referee text"""
-        import re
-
-        numbers = re.findall(r'\d+\.?\d*', text)
-        if len(numbers) >= 2:
-            red_cards = float(numbers[0]) if numbers[0] else 0.0
-            yellow_cards = float(numbers[1]) if numbers[1] else 0.0
-            return red_cards, yellow_cards
-        
-        return None, None
-
-    # Helper function to extract vote percentages
-    def extract_vote_percentage(text):
-        """Extract percentage from voting text like '83%'"""
-        import re
-        match = re.search(r'(\d+)%', text)
-        return int(match.group(1)) if match else None
-
-    # Helper function to extract total votes
-    def extract_total_votes(text):
-        """Extract total votes from text like 'Total votes: 121k'"""
-        import re
-
-        match = re.search(r'Total votes:\s*(\d+(?:\.\d+)?)(k|K|m|M)?', text)
-        if match:
-            number = float(match.group(1))
-            multiplier = match.group(2)
-
-            if multiplier and multiplier.lower() == 'k':
-                return int(number * 1000)
-            elif multiplier and multiplier.lower() == 'm':
-                return int(number * 1_000_000)
-            else:
-                return int(number)
-        
-        return None
-    
 
+@functools.lru_cache(maxsize=32)
+def get_season_xpath(season):
+    """SEASON_OPTION_XPATH expanded for one season, built once per season."""
+    return ScrapingConfig.SEASON_OPTION_XPATH.format(season=season)
+
+
+# Text parsers shared by the Selenium and Playwright scrapers, so both
+# produce the same record for the same page.
+def parse_card_stats(text):
+    """Red and yellow card averages from a block containing 'Avg. cards', or (None, None)."""
+    match = _CARD_RE.search(text)
+    if match:
+        return float(match.group(1)), float(match.group(2))
+    numbers = _DECIMAL_RE.findall(text)
+    if len(numbers) >= 2:
+        return float(numbers[0]), float(numbers[1])
+    return None, None
+
+
+def parse_percentage(text):
+    """Percentage from text like '83%', or "N/A"."""
+    match = _PCT_RE.search(text)
+    return int(match.group(1)) if match else "N/A"
+
+
+def parse_total_votes(text):
+    """Vote count as a string from 'Total votes: 12,345' or 'Total votes: 121k', or "N/A"."""
+    m = _VOTES_RE.search(text)
+    if not m:
+        return "N/A"
+    number = m.group(1).replace(",", "")
+    suffix = m.group(2).lower()
+    try:
+        if suffix == 'k':
+            return str(int(float(number) * 1000))
+        if suffix == 'm':
+            return str(int(float(number) * 1_000_000))
+    except ValueError:
+        return "N/A"
+    return number
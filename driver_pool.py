@@ -0,0 +1,105 @@
+# epl_scraper/driver_pool.py
+
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+
+from .scraper import SofaScoreEPLScraper
+from .config import ScrapingConfig, CHROME_PROFILE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPool:
+    """Keeps a fixed number of warm scrapers, each already on the right season.
+
+    A scraper is recycled (quit and replaced) after `recycle_after` checkouts
+    so memory leaked by long-lived Chrome sessions stays bounded.
+
+    Chrome locks its user-data-dir, so every live driver gets a profile
+    directory of its own. There is one spare, so a replacement can start
+    before the driver it recycles quits.
+    """
+
+    def __init__(self, size, season, headless=True, recycle_after=ScrapingConfig.DRIVER_RECYCLE_AFTER):
+        self.size = size
+        self.season = season
+        self.headless = headless
+        self.recycle_after = recycle_after
+        self._idle = queue.Queue()
+        self._uses = {}
+        self._live = []
+        self._lock = threading.Lock()
+        self._profiles = queue.Queue()
+        base_port = ScrapingConfig.REMOTE_DEBUGGING_PORT
+        for i in range(size + 1):
+            self._profiles.put((f"{CHROME_PROFILE_DIR}-{i}", base_port + i if base_port else None))
+
+    def _spawn(self):
+        try:
+            profile, port = self._profiles.get_nowait()
+        except queue.Empty:
+            profile, port = None, None
+        scraper = SofaScoreEPLScraper(headless=self.headless, profile_dir=profile, debugger_port=port)
+        with self._lock:
+            self._live.append(scraper)
+        scraper.setup_driver()
+        scraper.driver.get(scraper.base_url)
+        # Both calls record their result on the driver, so any later call
+        # on this pooled scraper returns immediately.
+        scraper.dismiss_cookies()
+        if not scraper.select_season(self.season):
+            self._discard(scraper)
+            raise RuntimeError(f"Failed to select season {self.season}.")
+        self._uses[id(scraper)] = 0
+        return scraper
+
+    def _discard(self, scraper):
+        # Close an attached Chrome too, or recycling would re-attach to the same grown browser
+        scraper.quit(close_browser=True)
+        if scraper.profile_dir:
+            self._profiles.put((scraper.profile_dir, scraper.debugger_port))
+        with self._lock:
+            self._live.remove(scraper)
+            self._uses.pop(id(scraper), None)
+
+    def start(self):
+        logger.info(f"Warming up {self.size} WebDriver(s)...")
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+        logger.info("Driver pool ready.")
+
+    def get(self):
+        return self._idle.get()
+
+    def put(self, scraper):
+        self._uses[id(scraper)] += 1
+        if self._uses[id(scraper)] >= self.recycle_after:
+            try:
+                fresh = self._spawn()
+            except Exception as e:
+                logger.warning(f"Could not recycle driver, keeping the old one: {e}")
+                self._uses[id(scraper)] = 0
+            else:
+                logger.info(f"Recycled driver after {self.recycle_after} checkouts.")
+                self._discard(scraper)
+                scraper = fresh
+        self._idle.put(scraper)
+
+    @contextmanager
+    def checkout(self):
+        scraper = self.get()
+        try:
+            yield scraper
+        finally:
+            self.put(scraper)
+
+    def close(self):
+        with self._lock:
+            live = list(self._live)
+            self._live.clear()
+            self._uses.clear()
+        # Only detach: an attached Chrome stays up for the next run to reuse
+        for scraper in live:
+            scraper.quit()
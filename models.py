@@ -0,0 +1,32 @@
+# epl_scraper/models.py
+
+from dataclasses import dataclass, field, fields, asdict
+
+
+@dataclass(slots=True)
+class MatchRecord:
+    """One scraped match. Slots keep per-record overhead well below a dict's."""
+    match_id: str
+    source_url: str = ""
+    matchday: int | None = None
+    date_time_info: dict = field(default_factory=dict)
+    teams: dict = field(default_factory=dict)
+    venue: dict = field(default_factory=dict)
+    referee: dict = field(default_factory=dict)
+    odds: dict = field(default_factory=dict)
+    crowd_voting: dict = field(default_factory=dict)
+    statistics: dict = field(default_factory=dict)
+    commentary: list | None = None
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{k: v for k, v in data.items() if k in _FIELD_NAMES})
+
+    def to_dict(self):
+        out = asdict(self)
+        if out['commentary'] is None:
+            del out['commentary']
+        return out
+
+
+_FIELD_NAMES = frozenset(f.name for f in fields(MatchRecord))
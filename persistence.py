@@ -0,0 +1,316 @@
+# epl_scraper/persistence.py
+
+import json
+import logging
+import os
+import re
+import sys
+
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is the fallback
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional, only used to stream very large snapshots
+    ijson = None
+
+from .config import JSON_FILE_PATH, JSONL_FILE_PATH, SCRAPED_IDS_PATH, ROUND_LINKS_PATH, STATS_PARQUET_PATH
+from .models import MatchRecord
+
+logger = logging.getLogger(__name__)
+
+# Snapshots bigger than this are streamed item by item when ijson is available
+STREAM_THRESHOLD_BYTES = 100 * 1024 * 1024
+_DECODE_ERRORS = (ValueError, ijson.JSONError) if ijson is not None else (ValueError,)
+_LEADING_NUMBER_RE = re.compile(r'-?\d+(?:\.\d+)?')
+# JSONL logs whose tail has been checked by this process
+_checked_logs = set()
+
+
+def _encode(obj):
+    if isinstance(obj, MatchRecord):
+        return obj.to_dict()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+
+def _dumps(obj, indent=False):
+    if orjson is not None:
+        option = orjson.OPT_PASSTHROUGH_DATACLASS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=_encode, option=option)
+    return json.dumps(obj, default=_encode, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def _loads(raw):
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch one type
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _read_json(path):
+    with open(path, 'rb') as f:
+        return _loads(f.read())
+
+
+def iter_snapshot(path=JSON_FILE_PATH):
+    """Yields the matches of a JSON snapshot, streaming with ijson when installed."""
+    if not os.path.exists(path):
+        return
+    if ijson is None:
+        yield from _read_json(path)
+        return
+    with open(path, 'rb') as f:
+        yield from ijson.items(f, 'item', use_float=True)
+
+
+def _intern_keys(obj):
+    # Each JSONL line is decoded separately, so without this every record
+    # carries its own copies of the same few dozen key strings.
+    if isinstance(obj, dict):
+        return {sys.intern(k): _intern_keys(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_intern_keys(v) for v in obj]
+    return obj
+
+
+def iter_data(path=JSON_FILE_PATH, jsonl_path=JSONL_FILE_PATH, strict=False):
+    """Lazily yields every saved match: the snapshot's, then those appended since.
+
+    Only the match ids seen so far are held; a snapshot over
+    STREAM_THRESHOLD_BYTES is streamed when ijson is installed. An unreadable
+    snapshot is skipped with a warning, or raised when strict is set.
+    """
+    seen = set()
+    if os.path.exists(path):
+        try:
+            if ijson is not None and os.path.getsize(path) > STREAM_THRESHOLD_BYTES:
+                snapshot = iter_snapshot(path)
+            else:
+                snapshot = _read_json(path)
+            for entry in snapshot:
+                seen.add(entry.get('match_id'))
+                yield entry
+        except (OSError, *_DECODE_ERRORS) as e:
+            if strict:
+                raise
+            logger.warning(f"Could not read {path}: {e}")
+
+    # Matches appended since the last full snapshot
+    for entry in iter_appended(jsonl_path):
+        if entry.get('match_id') not in seen:
+            seen.add(entry.get('match_id'))
+            yield entry
+
+
+def load_data(path=JSON_FILE_PATH, jsonl_path=JSONL_FILE_PATH):
+    data = list(iter_data(path, jsonl_path))
+    logger.info(f"Loaded {len(data)} matches.")
+    return data
+
+
+def iter_records(path=JSON_FILE_PATH, jsonl_path=JSONL_FILE_PATH):
+    return (MatchRecord.from_dict(m) for m in iter_data(path, jsonl_path))
+
+
+def load_records(path=JSON_FILE_PATH, jsonl_path=JSONL_FILE_PATH):
+    return list(iter_records(path, jsonl_path))
+
+
+def load_saved_ids(path=JSON_FILE_PATH, jsonl_path=JSONL_FILE_PATH):
+    """Match ids of every saved match, read without keeping the matches."""
+    return {m['match_id'] for m in iter_data(path, jsonl_path) if m.get('match_id')}
+
+
+def save_data(data, path=JSON_FILE_PATH):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(_dumps(data, indent=True))
+    os.replace(tmp, path)
+    logger.info(f"Saved {len(data)} matches to {path}.")
+
+
+def _repair_tail(path):
+    """Makes the JSONL log end on a line boundary before anything is appended.
+
+    A run killed mid-write leaves a last line without its newline; appending
+    straight after it would glue the next record onto it and lose both. A
+    complete last record just gets its newline, a torn fragment is cut off.
+    """
+    try:
+        f = open(path, 'rb+')
+    except FileNotFoundError:
+        return
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b'\n':
+            return
+        start, pos = 0, end
+        while pos > 0:
+            step = min(64 * 1024, pos)
+            pos -= step
+            f.seek(pos)
+            i = f.read(step).rfind(b'\n')
+            if i != -1:
+                start = pos + i + 1
+                break
+        f.seek(start)
+        try:
+            _loads(f.read())
+        except ValueError:
+            logger.warning(f"Dropping a torn last line from {path}.")
+            f.truncate(start)
+        else:
+            f.write(b'\n')
+
+
+def save_snapshot(path=JSON_FILE_PATH, jsonl_path=JSONL_FILE_PATH):
+    """Folds the JSONL log into the JSON snapshot and empties the log.
+
+    Matches are streamed from iter_data into a temp file one at a time, so
+    memory stays flat and the log never grows past one flush interval. If the
+    old snapshot cannot be read, nothing is written or truncated and False
+    is returned.
+    """
+    tmp = f"{path}.tmp"
+    count = 0
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(b'[')
+            for entry in iter_data(path, jsonl_path, strict=True):
+                f.write(b',\n' if count else b'\n')
+                f.write(_dumps(entry, indent=True))
+                count += 1
+            f.write(b'\n]' if count else b']')
+    except (OSError, *_DECODE_ERRORS) as e:
+        logger.error(f"Could not rebuild {path}, keeping it and {jsonl_path} as they are: {e}")
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return False
+    os.replace(tmp, path)
+    # Everything the log held is in the snapshot now
+    if os.path.exists(jsonl_path):
+        open(jsonl_path, 'wb').close()
+    logger.info(f"Saved {count} matches to {path}.")
+    return True
+
+
+def save_data_append(entry, path=JSONL_FILE_PATH):
+    if path not in _checked_logs:
+        _repair_tail(path)
+        _checked_logs.add(path)
+    with open(path, 'ab') as f:
+        f.write(_dumps(entry) + b'\n')
+
+
+def iter_appended(path=JSONL_FILE_PATH):
+    """Lazily yields the matches stored in the JSONL log, one at a time."""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield _intern_keys(_loads(line))
+            except json.JSONDecodeError:
+                # A run killed mid-write leaves a torn last line
+                logger.warning(f"Skipping unreadable line in {path}.")
+
+
+def _stat_number(value):
+    # "61%" -> 61.0, "5/10 (50%)" -> 5.0, "N/A" -> None
+    m = _LEADING_NUMBER_RE.match(value or "")
+    return float(m.group()) if m else None
+
+
+def save_stats_parquet(records, path=STATS_PARQUET_PATH):
+    """Writes every statistic row of `records` as one columnar Parquet table.
+
+    Names, periods and match ids are dictionary-encoded and values get float32
+    columns next to the raw strings, a fraction of the nested dicts' size.
+    pyarrow is imported here so it stays an optional dependency.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    match_ids, periods, names, home, away = [], [], [], [], []
+    for record in records:
+        for period, rows in (record.statistics or {}).items():
+            for row in rows:
+                match_ids.append(record.match_id)
+                periods.append(period)
+                names.append(row.get('name'))
+                home.append(row.get('home_value'))
+                away.append(row.get('away_value'))
+
+    table = pa.table({
+        'match_id': pa.array(match_ids, pa.string()).dictionary_encode(),
+        'period': pa.array(periods, pa.string()).dictionary_encode(),
+        'name': pa.array(names, pa.string()).dictionary_encode(),
+        'home_value': pa.array(home, pa.string()),
+        'away_value': pa.array(away, pa.string()),
+        'home': pa.array([_stat_number(v) for v in home], pa.float32()),
+        'away': pa.array([_stat_number(v) for v in away], pa.float32()),
+    })
+    pq.write_table(table, path)
+    logger.info(f"Saved {table.num_rows} stat rows to {path}.")
+
+
+def load_scraped_ids(path=SCRAPED_IDS_PATH):
+    """Returns the set of scraped match ids, or None if no id file exists yet."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def load_resume_ids(ids_path=SCRAPED_IDS_PATH, path=JSON_FILE_PATH, jsonl_path=JSONL_FILE_PATH):
+    """Ids of the matches whose records actually decode, to resume from.
+
+    The id file can list a match whose record was torn by a killed run, so it
+    is rewritten whenever it disagrees with the saved records.
+    """
+    saved = load_saved_ids(path, jsonl_path)
+    if load_scraped_ids(ids_path) != saved:
+        save_scraped_ids(saved, ids_path)
+    return saved
+
+
+def save_scraped_ids(ids, path=SCRAPED_IDS_PATH):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(f"{mid}\n" for mid in ids)
+
+
+def append_scraped_id(mid, path=SCRAPED_IDS_PATH):
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(f"{mid}\n")
+
+
+def _read_round_links(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        return _read_json(path)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Could not read {path}: {e}")
+        return {}
+
+
+def load_round_links(season, path=ROUND_LINKS_PATH):
+    """Returns the cached {matchday: [links]} map for a season (keys are strings)."""
+    return _read_round_links(path).get(season, {})
+
+
+def save_round_links(season, links_by_round, path=ROUND_LINKS_PATH):
+    all_links = _read_round_links(path)
+    all_links[season] = links_by_round
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(all_links, f, indent=2)
+    os.replace(tmp, path)
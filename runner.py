@@ -1,74 +1,253 @@
 # epl_scraper/runner.py
 
+import itertools
 import logging
-import random
-import time
+import multiprocessing
+import threading
 import sys
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing.util import Finalize
 
+from .api_client import SofaScoreAPIClient
+from .driver_pool import DriverPool
 from .scraper import SofaScoreEPLScraper
-from .persistence import save_data
+from .models import MatchRecord
+from .persistence import (
+    iter_records, save_snapshot, save_data_append,
+    load_resume_ids, append_scraped_id,
+    load_round_links, save_round_links, save_stats_parquet
+)
+from .config import ScrapingConfig, CHROME_PROFILE_DIR
+from .throttle import RateLimiter, CircuitBreaker
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def main(start_matchday=1, end_matchday=38, season="24/25", headless=True):
-    scraper = SofaScoreEPLScraper(headless=headless)
-
-    try:
-        scraper.setup_driver()
-        scraper.driver.get(scraper.base_url)
-        scraper.dismiss_cookies()
-
-        if not scraper.select_season(season):
-            logger.critical(f"Failed to select season {season}. Exiting.")
-            return
-
-        scraped_ids = {m['match_id'] for m in scraper.all_match_data}
-        logger.info(f"Already have {len(scraped_ids)} matches loaded.")
-
-        for md in range(start_matchday, end_matchday + 1):
-            logger.info(f"=== Matchday {md} ===")
+# The scraper owned by a worker process of scrape_urls_parallel
+_worker = None
+_worker_uses = 0
+
+
+def collect_match_links(scraper, season, start_matchday, end_matchday, scraped_ids, api=None):
+    cached = load_round_links(season)
+    matchdays = range(start_matchday, end_matchday + 1)
+    api_links = {}
+    if ScrapingConfig.USE_API:
+        api_links = (api or SofaScoreAPIClient()).fetch_rounds(
+            season, [md for md in matchdays if not cached.get(str(md))])
+
+    pending = []
+    queued = set()
+    for md in matchdays:
+        logger.info(f"=== Matchday {md} ===")
+        links = cached.get(str(md))
+        if links:
+            logger.info(f"Using {len(links)} cached links for MD {md}.")
+        elif api_links.get(md):
+            links = api_links[md]
+            logger.info(f"Found {len(links)} matches on MD {md} via API.")
+            cached[str(md)] = links
+            save_round_links(season, cached)
+        else:
             if not scraper.navigate_to_round(md):
                 logger.error(f"Couldn’t navigate to matchday {md}, skipping.")
                 continue
 
             links = scraper.get_match_links()
             logger.info(f"Found {len(links)} matches on MD {md}.")
+            if links:
+                cached[str(md)] = links
+                save_round_links(season, cached)
 
-            for link in links:
-                mid = link['match_id']
-                if mid in scraped_ids:
-                    logger.info(f"Skipping already scraped match {mid}.")
-                    continue
-
-                logger.info(f"Scraping match {mid}...")
-
+        for link in links:
+            if link['match_id'] in scraped_ids:
+                logger.info(f"Skipping already scraped match {link['match_id']}.")
+                continue
+            if link['match_id'] in queued:
+                logger.info(f"Match {link['match_id']} already queued from another round.")
+                continue
+            queued.add(link['match_id'])
+            pending.append((md, link))
+    return pending
+
+
+def scrape_via_api(api, pending, store):
+    """Scrapes queued matches round by round over the JSON API, each round's
+    matches concurrently. Returns the matches left for the browser; once the
+    API turns out to be unavailable, every remaining match goes there as is."""
+    leftover = []
+    for md, group in itertools.groupby(pending, key=lambda item: item[0]):
+        group = list(group)
+        if api.unavailable:
+            leftover.extend(group)
+            continue
+        logger.info(f"Scraping {len(group)} matches of MD {md} via API...")
+        results = api.scrape_round([(link['match_id'], md) for _, link in group])
+        for item, data in zip(group, results):
+            if data:
+                store(item[1], data)
+            else:
+                leftover.append(item)
+    return leftover
+
+
+def _start_worker_driver():
+    _worker.setup_driver()
+    _worker.driver.get(_worker.base_url)
+    _worker.dismiss_cookies()
+
+
+def _init_worker(headless, profiles):
+    global _worker
+    _worker = SofaScoreEPLScraper(headless=headless, profile_dir=profiles.get())
+    _start_worker_driver()
+    # Pool workers leave through os._exit, which skips atexit; finalizers still run.
+    Finalize(_worker, _worker.quit, exitpriority=10)
+
+
+def _scrape_in_worker(url, matchday, try_api):
+    global _worker_uses
+    # Same bound on leaked Chrome memory as DriverPool's recycling
+    if _worker_uses >= ScrapingConfig.DRIVER_RECYCLE_AFTER:
+        logger.info(f"Restarting worker driver after {_worker_uses} matches.")
+        _worker.quit()
+        _start_worker_driver()
+        _worker_uses = 0
+    _worker_uses += 1
+    return _worker.scrape_match(url, matchday=matchday, try_api=try_api)
+
+
+def scrape_urls_parallel(items, workers, headless, limiter, breaker, try_api=True):
+    """Scrapes (matchday, link) items on `workers` processes, each driving its
+    own Chrome. Yields (item, data) as they finish; data is None on failure."""
+    ctx = multiprocessing.get_context("spawn")
+    profiles = ctx.Queue()
+    for i in range(workers):
+        profiles.put(f"{CHROME_PROFILE_DIR}-proc{i}")
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(headless, profiles)) as executor:
+        items = iter(items)
+        running = {}
+        while True:
+            # Submit lazily so the limiter and breaker gate actual page loads.
+            for item in itertools.islice(items, workers - len(running)):
+                breaker.wait_if_open()
+                limiter.acquire()
+                running[executor.submit(_scrape_in_worker, item[1]['url'], item[0], try_api)] = item
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = running.pop(future)
                 try:
-                    data = scraper.scrape_match(link['url'], matchday=md)
-                except KeyboardInterrupt:
-                    logger.warning("Scraper interrupted by user (Ctrl + C) while scraping match.")
-                    raise
+                    data = future.result()
                 except Exception as e:
-                    logger.exception(f"Unexpected error scraping match {mid}: {e}")
+                    logger.exception(f"Worker failed on match {item[1]['match_id']}: {e}")
                     data = None
+                yield item, data
+
+
+def main(start_matchday=1, end_matchday=38, season="24/25", headless=True,
+         max_concurrency=ScrapingConfig.MAX_CONCURRENCY, flush_every=ScrapingConfig.SNAPSHOT_FLUSH_EVERY,
+         processes=False, stats_parquet_path=None):
+    # In processes mode the parent's browser only collects links; the workers bring their own.
+    pool = DriverPool(size=1 if processes else max_concurrency, season=season, headless=headless)
+    limiter = RateLimiter(ScrapingConfig.REQUESTS_PER_SECOND, burst=ScrapingConfig.RATE_LIMIT_BURST)
+    api_limiter = RateLimiter(ScrapingConfig.API_REQUESTS_PER_SECOND, burst=ScrapingConfig.API_MAX_CONCURRENCY)
+    breaker = CircuitBreaker(ScrapingConfig.CIRCUIT_BREAKER_FAIL_THRESHOLD, ScrapingConfig.CIRCUIT_BREAKER_COOLDOWN)
+    api = SofaScoreAPIClient(limiter=api_limiter, breaker=breaker)
+    data_lock = threading.Lock()
+    scraped_ids = load_resume_ids()
+    unsaved = 0
+
+    def store(link, data):
+        nonlocal unsaved
+        mid = link['match_id']
+        data['match_id'] = sys.intern(mid) if isinstance(mid, str) else mid
+        data['source_url'] = link['url']
+        record = MatchRecord.from_dict(data)
+        with data_lock:
+            save_data_append(record)
+            scraped_ids.add(mid)
+            append_scraped_id(mid)
+            unsaved += 1
+            if unsaved >= flush_every:
+                save_snapshot()
+                unsaved = 0
+
+    def finish(link, data):
+        if data:
+            breaker.record_success()
+            store(link, data)
+        else:
+            logger.error(f"Failed to scrape match {link['match_id']}.")
+            if breaker.record_failure():
+                logger.warning(
+                    f"{breaker.threshold} consecutive failures, pausing all workers for {breaker.cooldown}s."
+                )
+
+    def scrape_one(item):
+        md, link = item
+        mid = link['match_id']
+        breaker.wait_if_open()
+        limiter.acquire()
+        logger.info(f"Scraping match {mid}...")
+
+        try:
+            with pool.checkout() as worker:
+                data = worker.scrape_match(link['url'], matchday=md, try_api=try_api)
+        except Exception as e:
+            logger.exception(f"Unexpected error scraping match {mid}: {e}")
+            data = None
+        finish(link, data)
 
-                if data:
-                    data['match_id'] = mid
-                    data['source_url'] = link['url']
-                    scraper.all_match_data.append(data)
-                    save_data(scraper.all_match_data)
-                    scraped_ids.add(mid)
-                else:
-                    logger.error(f"Failed to scrape match {mid}.")
+    try:
+        try:
+            pool.start()
+        except RuntimeError as e:
+            logger.critical(f"{e} Exiting.")
+            return
+
+        logger.info(f"Already have {len(scraped_ids)} matches loaded.")
 
-                time.sleep(random.uniform(1, 3))
+        with pool.checkout() as scraper:
+            pending = collect_match_links(scraper, season, start_matchday, end_matchday, scraped_ids, api=api)
+        # Matches left over from the API pass go straight to the browser
+        try_api = not ScrapingConfig.USE_API
+        if ScrapingConfig.USE_API:
+            pending = scrape_via_api(api, pending, store)
+        logger.info(f"Queued {len(pending)} matches across {max_concurrency} workers.")
+
+        if processes and pending:
+            # The worker processes bring their own browsers.
+            pool.close()
+            for (md, link), data in scrape_urls_parallel(
+                    pending, max_concurrency, headless, limiter, breaker, try_api=try_api):
+                finish(link, data)
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_concurrency)
+            try:
+                for _ in executor.map(scrape_one, pending):
+                    pass
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        if stats_parquet_path:
+            try:
+                save_stats_parquet(iter_records(), stats_parquet_path)
+            except ImportError:
+                logger.warning("pyarrow is not installed, skipping the Parquet stats export.")
 
     except KeyboardInterrupt:
         logger.warning("Scraper manually stopped via Ctrl + C.")
     except Exception as e:
         logger.exception(f"Unhandled error in scraping process: {e}")
     finally:
-        scraper.quit()
+        with data_lock:
+            if unsaved:
+                save_snapshot()
+        pool.close()
         logger.info("Scraper shut down cleanly.")
 
 if __name__ == "__main__":
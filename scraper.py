@@ -1,10 +1,26 @@
 import re
+import subprocess
 import time
 import random
 import traceback
+import urllib.request
+from functools import lru_cache
 from datetime import datetime
 import logging
 
+import httpx
+
+try:
+    import ahocorasick
+except ImportError:  # optional speedup, the regex scan is the fallback
+    ahocorasick = None
+
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+except ImportError:  # optional, only used when in-page extraction is unavailable
+    CSSSelector = None
+
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -19,61 +35,267 @@ from selenium.common.exceptions import (
 from selenium.webdriver.common.action_chains import ActionChains
 
 from .logger import get_logger
-from .config import ScrapingConfig
+from .api_client import SofaScoreAPIClient, APIUnavailable
+from .config import (
+    ScrapingConfig, CHROME_PROFILE_DIR, get_season_xpath,
+    parse_card_stats, parse_percentage, parse_total_votes
+)
 from .utils import parse_datetime_from_text, retry
 from .persistence import load_data, save_data
 
 logger = get_logger(__name__, log_file="scraper.log", level=logging.DEBUG)
 
+_ROUND_RE = re.compile(r"Round (\d+)")
+_MATCH_ID_RE = re.compile(r'#id:(\d+)')
+_MINUTE_RE = re.compile(r"(\d{1,3}(?:\+\d+)?)'")
+_LEADING_MINUTE_RE = re.compile(r"^\d{1,3}(?:\+\d+)?'\s*")
+
+# Keyword -> event type, in the priority order classify_event_type checks them.
+_EVENT_KEYWORDS = (
+    ("goal", "goal"),
+    ("substitution", "substitution"), ("subbed", "substitution"), ("substituted", "substitution"),
+    ("yellow card", "yellow_card"), ("booked", "yellow_card"),
+    ("red card", "red_card"), ("sent off", "red_card"),
+    ("corner", "corner"),
+    ("foul", "foul"),
+    ("offside", "offside"),
+    ("penalty", "penalty"),
+    ("attempt", "attempt"), ("shot", "attempt"),
+    ("free kick", "free_kick"),
+    ("kick-off", "kick_off"), ("kick off", "kick_off"),
+    ("half time", "half_time"), ("half-time", "half_time"),
+    ("full time", "full_time"), ("full-time", "full_time"),
+    ("var", "var"),
+    ("injury", "injury"),
+)
+_EVENT_RANKS = {kw: (rank, kind) for rank, (kw, kind) in enumerate(_EVENT_KEYWORDS)}
+# A lookahead so overlapping keywords ("kick-off" inside "free kick-off") are all seen.
+_EVENT_RE = re.compile("(?=(%s))" % "|".join(re.escape(kw) for kw, _ in _EVENT_KEYWORDS))
+_HAS_DIGIT = re.compile(r"\d").search
+_COMMENTARY_KEYWORD_RE = re.compile(
+    "|".join(re.escape(kw) for kw in ScrapingConfig.COMMENTARY_KEYWORDS), re.IGNORECASE)
+_EVENT_AUTOMATON = None
+if ahocorasick is not None:
+    _EVENT_AUTOMATON = ahocorasick.Automaton()
+    for _kw, _rank in _EVENT_RANKS.items():
+        _EVENT_AUTOMATON.add_word(_kw, _rank)
+    _EVENT_AUTOMATON.make_automaton()
+
+
+def _locator(sel):
+    return (By.XPATH if sel.startswith("//") else By.CSS_SELECTOR, sel)
+
+
+# Locators built once at import instead of per lookup
+_SEASON_TEXT = (By.CSS_SELECTOR, ScrapingConfig.CURRENT_SEASON_TEXT_SELECTOR)
+_SEASON_DROPDOWN = (By.CSS_SELECTOR, ScrapingConfig.SEASON_DROPDOWN_SELECTOR)
+_ROUND_TEXT = (By.CSS_SELECTOR, ScrapingConfig.ROUND_TEXT_SELECTOR)
+_ROUND_DROPDOWN = (By.CSS_SELECTOR, ScrapingConfig.ROUND_DROPDOWN_BUTTON)
+_NEXT_ROUND = (By.CSS_SELECTOR, ScrapingConfig.NEXT_ROUND_ARROW)
+_PREV_ROUND = (By.CSS_SELECTOR, ScrapingConfig.PREV_ROUND_ARROW)
+_MATCH_LINK = (By.CSS_SELECTOR, ScrapingConfig.MATCH_LINK_SELECTOR)
+_MATCH_DATE_TIME = (By.CSS_SELECTOR, ScrapingConfig.MATCH_DATE_TIME_CONTAINER)
+_TEAM = (By.CSS_SELECTOR, ScrapingConfig.TEAM_SELECTOR)
+_ODDS = (By.CSS_SELECTOR, ScrapingConfig.ODDS_SELECTOR)
+_SURFACE_BLOCK = (By.CSS_SELECTOR, ScrapingConfig.VENUE_SECTION_ALT)
+_CROWD_VOTING_SECTION = (By.XPATH, ScrapingConfig.CROWD_VOTING_SECTION_XPATH)
+_VOTE_PERCENT = (By.CSS_SELECTOR, ScrapingConfig.VOTE_PERCENT_SELECTOR)
+_STATS_CONTAINER = (By.CSS_SELECTOR, "div.Box.Flex.gQxTzO")
+_STAT_ROW = (By.CSS_SELECTOR, ScrapingConfig.STAT_ROW)
+_COMMENTARY_ENTRY = (By.CSS_SELECTOR, ScrapingConfig.COMMENTARY_ENTRY_CONTAINER)
+_COMMENTARY_TABS = tuple(_locator(sel) for sel in (
+    "//span[contains(text(), 'Commentary')]",
+    "//a[contains(text(), 'Commentary')]",
+    "//button[contains(text(), 'Commentary')]",
+    "div[data-tabid='commentary']",
+    "a[href*='commentary']",
+))
+_LOAD_MORE = tuple((By.CSS_SELECTOR, sel) for sel in ScrapingConfig.LOAD_MORE_SELECTORS)
+
+
+@lru_cache(maxsize=64)
+def _round_option(target):
+    return (By.XPATH, f"//ul[@role='listbox']//li[@role='option' and text()='Round {target}']")
+
+
+def _season_option(season):
+    # get_season_xpath already caches the expanded XPath per season
+    return (By.XPATH, get_season_xpath(season))
+
+
+@lru_cache(maxsize=8)
+def _stats_tab(tab_id):
+    return (By.CSS_SELECTOR, f"div[data-tabid='{tab_id}']")
+
+
+@lru_cache(maxsize=64)
+def _css(sel):
+    return CSSSelector(sel)
+
+
+def _looks_like_commentary_text(text):
+    # Commentary entries typically have some text and might contain time stamps
+    return len(text) > 5 and (_HAS_DIGIT(text) is not None or _COMMENTARY_KEYWORD_RE.search(text) is not None)
+
+
+def _parse_commentary_html(html):
+    """Local twin of COMMENTARY_CONTAINERS_JS + COMMENTARY_EXTRACT_JS over page HTML."""
+    def text(e):
+        return e.text_content().strip()
+
+    tree = lxml.html.fromstring(html)
+    entries = _css(ScrapingConfig.COMMENTARY_ENTRY_CONTAINER)(tree)
+    for sel in ScrapingConfig.COMMENTARY_ALT_CONTAINERS if not entries else ():
+        entries = [e for e in _css(sel)(tree) if _looks_like_commentary_text(text(e))]
+        if entries:
+            break
+
+    def first_hit(entry, selectors, ok):
+        for sel in selectors:
+            found = _css(sel)(entry)
+            if found and ok(text(found[0])):
+                return text(found[0])
+        return None
+
+    parsed = []
+    for entry in entries:
+        full = text(entry)
+        time_text = first_hit(entry, ScrapingConfig.COMMENTARY_TIME_SELECTORS, lambda t: "'" in t)
+        if not time_text:
+            m = _MINUTE_RE.search(full)
+            time_text = m.group(1) + "'" if m else "N/A"
+        body = first_hit(entry, ScrapingConfig.COMMENTARY_TEXT_SELECTORS, lambda t: len(t) > 3)
+        if not body:
+            body = (_LEADING_MINUTE_RE.sub("", full) or full) if full else "N/A"
+        parsed.append({"time": time_text, "text": body})
+    return parsed
+
+
+def _label_values(block_text):
+    """Map each line of a key/value card's innerText to the line after it."""
+    lines = [line.strip() for line in block_text.split("\n") if line.strip()]
+    values = {}
+    for label, value in zip(lines, lines[1:]):
+        values.setdefault(label, value)
+    return values
+
+
+def _devtools_ready(port):
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=1):
+            return True
+    except OSError:
+        return False
+
 
 class SofaScoreEPLScraper:
-    def __init__(self, headless=True, implicit_wait=10):
+    def __init__(self, headless=True, implicit_wait=0, profile_dir=None, debugger_port=None):
         self.base_url = "https://www.sofascore.com/tournament/football/england/premier-league/17"
         self.headless = headless
         self.implicit_wait = implicit_wait
+        self.profile_dir = profile_dir
+        self.debugger_port = debugger_port
+        self._chrome_proc = None
         self.driver = None
         self.wait = None
         self.original_tab = None
-        self.all_match_data = load_data()
+        self._round_elt = None
+        self._surface_blocks = None
+        self._surface_texts = None
+        self._all_match_data = None
         self.logger = logger
         self.config = ScrapingConfig
+        self.api = SofaScoreAPIClient()
 
         logger.info("SofaScoreEPLScraper initialized.")
 
+    @property
+    def all_match_data(self):
+        """Previously saved matches, read from disk on first access."""
+        if self._all_match_data is None:
+            self._all_match_data = load_data()
+        return self._all_match_data
 
     # --- Driver Management & Utilities ---
+    def _chrome_args(self):
+        args = []
+        if self.headless:
+            logger.info("Running Chrome in headless mode.")
+            args += [
+                "--headless=new", "--disable-gpu", "--disable-software-rasterizer",
+                "--enable-unsafe-webgpu", "--enable-unsafe-swiftshader",
+            ]
+        if self.profile_dir:
+            args.append(f"--user-data-dir={self.profile_dir}")
+        args += [
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--window-size=1920,1080",
+            "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+            "--disable-blink-features=AutomationControlled",
+            "--blink-settings=imagesEnabled=false",
+        ]
+        return args
+
+    def _start_debuggable_chrome(self, args):
+        """Starts a detached Chrome on debugger_port unless one already listens there."""
+        if _devtools_ready(self.debugger_port):
+            logger.info(f"Attaching to running Chrome on port {self.debugger_port}.")
+            return
+        cmd = [ScrapingConfig.CHROME_BINARY, f"--remote-debugging-port={self.debugger_port}", *args]
+        if not self.profile_dir:
+            # Chrome refuses remote debugging on its default profile
+            cmd.append(f"--user-data-dir={CHROME_PROFILE_DIR}-{self.debugger_port}")
+        logger.info(f"Launching Chrome with remote debugging on port {self.debugger_port}...")
+        self._chrome_proc = subprocess.Popen(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+        deadline = time.monotonic() + ScrapingConfig.CHROME_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if _devtools_ready(self.debugger_port):
+                return
+            time.sleep(ScrapingConfig.PAGE_READY_POLL)
+        raise WebDriverException(f"Chrome did not open debugging port {self.debugger_port}.")
+
     def setup_driver(self):
         logger.info("Setting up Selenium WebDriver...")
+        args = self._chrome_args()
         opts = Options()
-        if self.headless:
-            logger.info("Running Chrome in headless mode.")
-            opts.add_argument("--headless=new")
-            opts.add_argument("--disable-gpu")
-            opts.add_argument("--disable-software-rasterizer")
-            opts.add_argument("--enable-unsafe-webgpu")
-            opts.add_argument("--enable-unsafe-swiftshader")
-            opts.add_argument("--incognito")
-            opts.add_argument("--disable-cache")
-            opts.add_argument("--disable-application-cache")
-            opts.add_argument("--disk-cache-size=0")
-        opts.add_argument("--no-sandbox")
-        opts.add_argument("--disable-dev-shm-usage")
-        opts.add_argument("--window-size=1920,1080")
-        opts.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64)")
-        opts.add_experimental_option("excludeSwitches", ["enable-automation"])
-        opts.add_experimental_option("useAutomationExtension", False)
-        opts.add_argument("--disable-blink-features=AutomationControlled")
+        if self.debugger_port:
+            # The browser outlives this session; quit() only detaches from it.
+            self._start_debuggable_chrome(args)
+            opts.debugger_address = f"127.0.0.1:{self.debugger_port}"
+        else:
+            for arg in args:
+                opts.add_argument(arg)
+            opts.add_experimental_option("excludeSwitches", ["enable-automation"])
+            opts.add_experimental_option("useAutomationExtension", False)
+            opts.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
 
         self.driver = webdriver.Chrome(options=opts)
         self.driver.implicitly_wait(self.implicit_wait)
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": ScrapingConfig.BLOCKED_URL_PATTERNS})
+            # Keep the HTTP cache on so the app's JS/CSS is reused between matches.
+            self.driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
+            logger.info("Blocking images, fonts, media and trackers.")
+        except WebDriverException as e:
+            logger.warning(f"Could not enable resource blocking: {e}")
         self.wait = WebDriverWait(self.driver, 15)
         self.original_tab = self.driver.current_window_handle
+        # Per-session state so repeat calls on a warm driver can skip work
+        self.driver._cookies_dismissed = False
+        self.driver._season = None
         logger.info("WebDriver setup complete.")
 
-    def quit(self):
+    def quit(self, close_browser=False):
+        """Ends the WebDriver session. An attached Chrome keeps running for the
+        next session unless close_browser is set."""
         if self.driver:
             try:
                 if hasattr(self.driver, "session_id") and self.driver.session_id is not None:
+                    if close_browser and self.debugger_port:
+                        self._close_browser()
                     logger.info("Quitting WebDriver...")
                     self.driver.quit()
                     logger.info("WebDriver quit successfully.")
@@ -81,9 +303,35 @@ class SofaScoreEPLScraper:
                     logger.info("WebDriver session already closed.")
             except Exception as e:
                 logger.warning(f"Error during driver.quit(): {e}")
+        if close_browser and self._chrome_proc is not None:
+            self._reap_chrome()
+
+    def _close_browser(self):
+        # Also closes a Chrome attached from an earlier run, which has no process handle here
+        try:
+            self.driver.execute_cdp_cmd("Browser.close", {})
+            logger.info(f"Closed Chrome on debugging port {self.debugger_port}.")
+        except WebDriverException as e:
+            logger.debug(f"Browser.close failed: {e}")
+
+    def _reap_chrome(self):
+        proc, self._chrome_proc = self._chrome_proc, None
+        try:
+            proc.wait(timeout=ScrapingConfig.CHROME_START_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Chrome on port {self.debugger_port} did not exit, terminating it.")
+            proc.terminate()
+            try:
+                proc.wait(timeout=ScrapingConfig.CHROME_START_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
 
     @retry(retries=3, backoff=1)
     def dismiss_cookies(self):
+        if getattr(self.driver, "_cookies_dismissed", False):
+            logger.info("Cookie consent already dismissed for this session.")
+            return True
         logger.info("Attempting to dismiss cookie consent popups...")
         selectors = [
             (By.ID, "onetrust-accept-btn-handler"),
@@ -92,12 +340,32 @@ class SofaScoreEPLScraper:
             (By.XPATH, "//button[contains(., 'Accept All') or contains(., 'Consent')]"),
             (By.XPATH, "//button[contains(., 'Accept cookies') or contains(., 'Allow all')]"),
         ]
-        for by, sel in selectors:
+        # Persistent profiles keep OneTrust's consent cookie, so the banner never
+        # shows again; don't wait out every selector for it.
+        if self.driver.get_cookie("OptanonAlertBoxClosed"):
+            logger.info("Cookie consent already stored in this profile.")
+            self.driver._cookies_dismissed = True
+            return True
+
+        def banner_present(driver):
+            return [s for s in selectors if driver.find_elements(*s)] or False
+
+        try:
+            present = WebDriverWait(self.driver, ScrapingConfig.COOKIE_BANNER_WAIT).until(banner_present)
+        except TimeoutException:
+            logger.info("No cookie banner shown.")
+            self.driver._cookies_dismissed = True
+            return True
+        for by, sel in present:
             try:
                 btn = self.wait.until(EC.element_to_be_clickable((by, sel)))
                 btn.click()
                 logger.info(f"Clicked cookie button: {by} {sel}")
-                time.sleep(1)
+                try:
+                    WebDriverWait(self.driver, 5).until(EC.invisibility_of_element_located((by, sel)))
+                except TimeoutException:
+                    logger.debug("Cookie button still visible, continuing.")
+                self.driver._cookies_dismissed = True
                 return True
             except Exception:
                 continue
@@ -108,7 +376,6 @@ class SofaScoreEPLScraper:
         for i in range(retries):
             try:
                 self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", elt)
-                time.sleep(0.2)
                 elt.click()
                 logger.info("Clicked element successfully.")
                 return True
@@ -137,6 +404,16 @@ class SofaScoreEPLScraper:
             logger.warning(f"Element not found: {by} {sel}")
             return None
 
+    def safe_find_visible(self, by, sel, timeout=15):
+        logger.debug(f"Waiting for visible element: {by} {sel}")
+        try:
+            elt = WebDriverWait(self.driver, timeout).until(EC.visibility_of_element_located((by, sel)))
+            logger.debug("Element visible.")
+            return elt
+        except TimeoutException:
+            logger.warning(f"Element not visible: {by} {sel}")
+            return None
+
     def safe_find_all(self, by, sel, timeout=30):
         logger.debug(f"Looking for multiple elements: {by} {sel}")
         try:
@@ -148,41 +425,118 @@ class SofaScoreEPLScraper:
             logger.warning(f"No elements found: {by} {sel}")
             return []
 
+    def wait_for_network_idle(self, idle_ms=ScrapingConfig.NETWORK_IDLE_MS, timeout=ScrapingConfig.PAGE_RELOAD_WAIT):
+        """Return once the page is loaded and no new resources finished for idle_ms.
+
+        PAGE_RELOAD_WAIT is now only the upper bound instead of a fixed sleep.
+        """
+        deadline = time.monotonic() + timeout
+        last_count, stable_since = None, time.monotonic()
+        while time.monotonic() < deadline:
+            try:
+                state, count = self.driver.execute_script(ScrapingConfig.PAGE_STATE_JS)
+            except WebDriverException as e:
+                logger.debug(f"Could not read page state: {e}")
+                state, count = None, None
+            now = time.monotonic()
+            if state == "complete" and count == last_count:
+                if now - stable_since >= idle_ms / 1000:
+                    logger.debug("Page is network idle.")
+                    return True
+            else:
+                last_count, stable_since = count, now
+            time.sleep(ScrapingConfig.PAGE_READY_POLL)
+        logger.debug(f"Page not idle after {timeout}s, continuing.")
+        return False
+
+    def _batch_extract(self, fields=None):
+        logger.debug(f"Batch extracting fields: {fields or 'all'}")
+        try:
+            snapshot = self.driver.execute_script(
+                ScrapingConfig.BATCH_EXTRACT_JS,
+                ScrapingConfig.BATCH_EXTRACT_SELECTORS,
+                list(fields) if fields else None,
+            )
+            return snapshot or {}
+        except WebDriverException as e:
+            logger.warning(f"Batch extraction failed, falling back to per-element lookups: {e}")
+            return {}
+
+    def _get_surface_blocks(self):
+        """The match page's key/value cards and their innerText, queried once per match."""
+        if self._surface_blocks is None:
+            self._surface_blocks = self.safe_find_all(*_SURFACE_BLOCK)
+            try:
+                self._surface_texts = self.driver.execute_script(
+                    "return Array.from(arguments[0], b => b.innerText);", self._surface_blocks)
+            except WebDriverException as e:
+                logger.debug(f"Could not read surface blocks in one call: {e}")
+                self._surface_texts = [b.text for b in self._surface_blocks]
+        return list(zip(self._surface_blocks, self._surface_texts))
+
+    def _query_all(self, sel, prop="innerText"):
+        logger.debug(f"Reading '{prop}' of all elements: {sel}")
+        try:
+            return self.driver.execute_script(ScrapingConfig.CSS_QUERY_JS, sel, prop) or []
+        except WebDriverException as e:
+            logger.warning(f"In-page query failed for {sel}: {e}")
+            return []
+
     # --- Page Navigation & Interaction ---
     def _is_season_selected(self, season):
-        elt = self.safe_find(By.CSS_SELECTOR, ScrapingConfig.CURRENT_SEASON_TEXT_SELECTOR)
+        elt = self.safe_find(*_SEASON_TEXT)
         result = elt and elt.text.strip() == season
         logger.info(f"Season {season} is currently selected: {result}")
         return result
 
     def select_season(self, season="24/25"):
         logger.info(f"Selecting season {season}...")
+        if getattr(self.driver, "_season", None) == season:
+            logger.info(f"Season {season} already selected for this session.")
+            return True
         if self._is_season_selected(season):
             logger.info(f"Season {season} already selected.")
+            self.driver._season = season
             return True
 
-        btn = self.safe_find(By.CSS_SELECTOR, ScrapingConfig.SEASON_DROPDOWN_SELECTOR)
+        btn = self.safe_find(*_SEASON_DROPDOWN)
         if not btn or not self.safe_click(btn):
             logger.warning("Failed to open season dropdown.")
             return False
-        time.sleep(ScrapingConfig.DROPDOWN_WAIT_TIME)
 
-        xpath = ScrapingConfig.SEASON_OPTION_XPATH.format(season=season)
-        opt = self.safe_find(By.XPATH, xpath, timeout=30)
+        opt = self.safe_find_visible(*_season_option(season))
         if not opt or not self.safe_click(opt):
             logger.warning(f"Failed to select season option {season}.")
             return False
 
-        time.sleep(ScrapingConfig.PAGE_RELOAD_WAIT)
+        self.wait_for_network_idle()
+        self.driver._season = season
         logger.info(f"Season {season} selected successfully.")
         return True
 
+    def _round_text(self, wait=False):
+        """Text of the round dropdown, reusing its element until the page replaces it."""
+        for _ in range(2):
+            if self._round_elt is None:
+                if wait:
+                    self._round_elt = self.safe_find(*_ROUND_TEXT)
+                else:
+                    elts = self.driver.find_elements(*_ROUND_TEXT)
+                    self._round_elt = elts[0] if elts else None
+                if self._round_elt is None:
+                    return None
+            try:
+                return self._round_elt.text.strip()
+            except StaleElementReferenceException:
+                self._round_elt = None
+        return None
+
     def _extract_round(self):
-        elt = self.safe_find(By.CSS_SELECTOR, ScrapingConfig.ROUND_TEXT_SELECTOR)
-        if not elt:
+        text = self._round_text(wait=True)
+        if text is None:
             logger.warning("Could not extract current round.")
             return None
-        m = re.search(r"Round (\d+)", elt.text.strip())
+        m = _ROUND_RE.search(text)
         round_num = int(m.group(1)) if m else None
         logger.info(f"Detected current round: {round_num}")
         return round_num
@@ -194,67 +548,91 @@ class SofaScoreEPLScraper:
             logger.info(f"Already on round {target}.")
             return True
 
-        btn = self.safe_find(By.CSS_SELECTOR, ScrapingConfig.ROUND_DROPDOWN_BUTTON)
+        btn = self.safe_find(*_ROUND_DROPDOWN)
         if btn and self.safe_click(btn):
-            time.sleep(ScrapingConfig.DROPDOWN_WAIT_TIME)
-            xpath = f"//ul[@role='listbox']//li[@role='option' and text()='Round {target}']"
-            opt = self.safe_find(By.XPATH, xpath, timeout=30)
+            opt = self.safe_find_visible(*_round_option(target))
             if opt and self.safe_click(opt):
-                time.sleep(ScrapingConfig.PAGE_RELOAD_WAIT)
+                self.wait_for_network_idle()
                 logger.info(f"Round {target} selected via dropdown.")
                 return True
 
         diff = target - (current or 0)
-        selector = ScrapingConfig.NEXT_ROUND_ARROW if diff > 0 else ScrapingConfig.PREV_ROUND_ARROW
+        arrow_locator = _NEXT_ROUND if diff > 0 else _PREV_ROUND
         for _ in range(abs(diff)):
-            arrow = self.safe_find(By.CSS_SELECTOR, selector)
+            old = self._round_text()
+            arrow = self.safe_find(*arrow_locator)
             if not arrow or not self.safe_click(arrow):
                 logger.error(f"Failed to navigate using arrows to round {target}.")
                 return False
-            time.sleep(ScrapingConfig.SCROLL_PAUSE_TIME)
-        time.sleep(ScrapingConfig.PAGE_RELOAD_WAIT)
+            try:
+                WebDriverWait(self.driver, ScrapingConfig.PAGE_RELOAD_WAIT).until(
+                    lambda d: self._round_text() not in (None, old))
+            except TimeoutException:
+                logger.warning("Round text did not change after arrow click.")
+        self.wait_for_network_idle()
         logger.info(f"Successfully navigated to round {target}.")
         return True
 
     def get_match_links(self):
         logger.info("Extracting match links...")
-        elems = self.safe_find_all(By.CSS_SELECTOR, ScrapingConfig.MATCH_LINK_SELECTOR)
+        hrefs = []
+        if self.safe_find(*_MATCH_LINK):
+            hrefs = self._query_all(ScrapingConfig.MATCH_LINK_SELECTOR, "href")
         links = []
-        for e in elems:
-            href = e.get_attribute('href') or ''
+        for href in hrefs:
+            href = href or ''
             if '/football/match/' in href:
                 full = href if href.startswith('http') else f"https://www.sofascore.com{href}"
-                mid = re.search(r'#id:(\d+)', href)
+                mid = _MATCH_ID_RE.search(href)
                 match_id = mid.group(1) if mid else href.rstrip('/').split('/')[-1]
                 links.append({'url': full, 'match_id': match_id})
         logger.info(f"Found {len(links)} match links.")
         return links
 
     # --- Main Scraping Logic ---
-    def scrape_match(self, url, matchday=None):
+    def _scrape_match_api(self, url, matchday=None):
+        mid = _MATCH_ID_RE.search(url)
+        if not mid:
+            return {}
+        try:
+            data = self.api.scrape_match(mid.group(1), matchday=matchday)
+            logger.info(f"Scraped {url} via API (Matchday {data['matchday']})")
+            return data
+        except (APIUnavailable, httpx.HTTPError) as e:
+            logger.warning(f"API scrape failed for {url}, falling back to browser: {e}")
+            return {}
+
+    def scrape_match(self, url, matchday=None, try_api=True):
+        """Scrapes one match page. try_api=False skips the JSON API attempt, for
+        matches the caller already failed to fetch through it."""
+        if try_api and self.config.USE_API:
+            data = self._scrape_match_api(url, matchday=matchday)
+            if data:
+                return data
+
         if matchday is None:
             matchday = self._extract_round()
         logger.info(f"Scraping match page: {url} (Matchday {matchday})")
 
         data = {}
+        self._surface_blocks = self._surface_texts = None
         try:
-            # Open new tab and navigate
-            self.driver.execute_script("window.open('');")
-            tab = self.driver.window_handles[-1]
-            self.driver.switch_to.window(tab)
-            time.sleep(ScrapingConfig.TAB_OPEN_WAIT)
+            # Navigate in place; the tournament page's season state goes with it.
+            self.driver._season = None
             self.driver.get(url)
-            time.sleep(3)
+            self.wait.until(EC.presence_of_element_located(_MATCH_DATE_TIME))
 
             # --- Main match data extraction ---
+            snapshot = self._batch_extract(
+                ('date_time', 'teams', 'venue', 'referee', 'odds', 'crowd_voting'))
             data = {
                 'matchday': matchday,
-                'date_time_info': self._get_date_time(),
-                'teams': self._get_teams(),
-                'venue': self._get_venue(),
-                'referee': self._get_referee(),
-                'odds': self._get_odds(),
-                'crowd_voting': self._get_crowd_voting(),
+                'date_time_info': self._get_date_time(snapshot),
+                'teams': self._get_teams(snapshot),
+                'venue': self._get_venue(snapshot),
+                'referee': self._get_referee(snapshot),
+                'odds': self._get_odds(snapshot),
+                'crowd_voting': self._get_crowd_voting(snapshot),
                 'statistics': self._get_stats(),
                 #'commentary': self._get_commentary()  # ✅ Added here
             }
@@ -273,26 +651,18 @@ class SofaScoreEPLScraper:
             logger.debug(traceback.format_exc())
             data = {}
 
-        finally:
-            # Close tab and return to original
-            try:
-                if (
-                    hasattr(self.driver, "session_id")
-                    and self.driver.session_id is not None
-                    and self.driver.window_handles
-                ):
-                    self.driver.close()
-                    self.driver.switch_to.window(self.original_tab)
-                    time.sleep(1)
-            except Exception as e:
-                logger.warning(f"Error closing tab or switching window: {e}")
-
         return data
     
     # --- Data Extraction Helpers (private methods) ---
-    def _get_date_time(self):
+    def _get_date_time(self, snapshot=None):
         logger.info("Extracting date and time...")
-        cnt = self.safe_find(By.CSS_SELECTOR, ScrapingConfig.MATCH_DATE_TIME_CONTAINER)
+        dt = (snapshot or {}).get('date_time') or []
+        if len(dt) >= 2:
+            result = {'date_time': f"{dt[0]} {dt[1]}", 'date': dt[0], 'time': dt[1]}
+            logger.info(f"Date & time extracted: {result}")
+            return result
+
+        cnt = self.safe_find(*_MATCH_DATE_TIME)
         if cnt:
             spans = cnt.find_elements(By.TAG_NAME, "span")
             if len(spans) >= 2:
@@ -302,47 +672,44 @@ class SofaScoreEPLScraper:
                     logger.info(f"Date & time extracted: {result}")
                     return result
 
+        not_found = {'date_time': 'Not found', 'date': 'Not found', 'time': 'Not found'}
         text = self.driver.find_element(By.TAG_NAME, 'body').text
+        if ScrapingConfig.COMBINED_DATE_RE.search(text) is None:
+            logger.info("No date pattern in page text")
+            return not_found
         parsed = parse_datetime_from_text(text)
         logger.info(f"Fallback date & time parsed: {parsed}")
-        return parsed or {'date_time': 'Not found', 'date': 'Not found', 'time': 'Not found'}
+        return parsed or not_found
 
-    def _get_teams(self):
+    def _get_teams(self, snapshot=None):
         logger.info("Extracting team names...")
-        imgs = self.safe_find_all(By.CSS_SELECTOR, ScrapingConfig.TEAM_SELECTOR)
-        home = imgs[0].get_attribute('alt').strip() if len(imgs) > 0 else "N/A"
-        away = imgs[1].get_attribute('alt').strip() if len(imgs) > 1 else "N/A"
+        names = (snapshot or {}).get('teams') or []
+        if len(names) < 2 and self.safe_find(*_TEAM):
+            names = self._query_all(ScrapingConfig.TEAM_SELECTOR, "alt")
+        home = names[0] if len(names) > 0 else "N/A"
+        away = names[1] if len(names) > 1 else "N/A"
         logger.info(f"Teams: Home = {home}, Away = {away}")
         return {'home_team': home, 'away_team': away}
 
-    def _get_venue(self):
+    def _get_venue(self, snapshot=None):
         self.logger.info("Extracting venue info...")
+        if snapshot and snapshot.get('venue_name'):
+            venue = {
+                "name": snapshot['venue_name'],
+                "location": snapshot.get('venue_location') or "N/A"
+            }
+            self.logger.info(f"Venue found: {venue['name']}, {venue['location']}")
+            return venue
         try:
             name = "N/A"
             location = "N/A"
 
-            venue_blocks = self.driver.find_elements(
-                By.CSS_SELECTOR,
-                "div[class*='bg_surface'][class*='elevation_2']"
-            )
-
-            for block in venue_blocks:
-                block_text = block.text
+            for _, block_text in self._get_surface_blocks():
 
                 if "Name" in block_text or "Location" in block_text:
-                    name_elements = block.find_elements(
-                        By.XPATH,
-                        ".//span[preceding-sibling::span[contains(text(), 'Name')]]"
-                    )
-                    if name_elements:
-                        name = name_elements[0].text.strip()
-
-                    location_elements = block.find_elements(
-                        By.XPATH,
-                        ".//span[preceding-sibling::span[contains(text(), 'Location')]]"
-                    )
-                    if location_elements:
-                        location = location_elements[0].text.strip()
+                    values = _label_values(block_text)
+                    name = values.get("Name", name)
+                    location = values.get("Location", location)
 
                     if name != "N/A" or location != "N/A":
                         break
@@ -369,42 +736,28 @@ class SofaScoreEPLScraper:
                 "location": "N/A"
             }
 
-    def _get_referee(self):
+    def _get_referee(self, snapshot=None):
         self.logger.info("Extracting referee info...")
+        if snapshot and snapshot.get('referee'):
+            red_cards, yellow_cards = self.extract_card_stats_from_text(snapshot.get('card_text') or "")
+            referee = {
+                "name": snapshot['referee'],
+                "avg_red_cards": str(red_cards) if red_cards is not None else "N/A",
+                "avg_yellow_cards": str(yellow_cards) if yellow_cards is not None else "N/A",
+                "attendance": snapshot.get('attendance') or "N/A"
+            }
+            self.logger.info(f"Referee: {referee}")
+            return referee
         try:
             referee_name = "N/A"
             avg_red_cards = "N/A"
             avg_yellow_cards = "N/A"
             attendance = "N/A"
 
-            blocks = self.driver.find_elements(
-                By.CSS_SELECTOR,
-                "div[class*='bg_surface'][class*='elevation_2']"
-            )
-
-            for block in blocks:
-                block_text = block.text
-
-                if "Attendance" in block_text:
-                    attendance_elements = block.find_elements(
-                        By.XPATH,
-                        ".//span[preceding-sibling::span[contains(text(), 'Attendance')]]"
-                    )
-                    if attendance_elements:
-                        attendance = attendance_elements[0].text.strip()
-
-                if "Referee" in block_text:
-                    referee_elements = block.find_elements(
-                        By.XPATH,
-                        ".//span[preceding-sibling::span[contains(text(), 'Referee')]]"
-                    )
-                    if referee_elements:
-                        nested_span = referee_elements[0].find_elements(By.XPATH, ".//span[1]")
-                        referee_name = (
-                            nested_span[0].text.strip()
-                            if nested_span
-                            else referee_elements[0].text.strip()
-                        )
+            for _, block_text in self._get_surface_blocks():
+                values = _label_values(block_text)
+                attendance = values.get("Attendance", attendance)
+                referee_name = values.get("Referee", referee_name)
 
                 if "Avg. cards" in block_text:
                     red_cards, yellow_cards = self.extract_card_stats_from_text(block_text)
@@ -436,27 +789,44 @@ class SofaScoreEPLScraper:
                 "attendance": "N/A"
             }
 
-    def _get_odds(self):
+    def _get_odds(self, snapshot=None):
         logger.info("Extracting odds info...")
         out = {'1': 'N/A', 'X': 'N/A', '2': 'N/A'}
-        elems = self.safe_find_all(By.CSS_SELECTOR, ScrapingConfig.ODDS_SELECTOR, timeout=30)
-        if len(elems) >= 3:
-            out['1'], out['X'], out['2'] = [e.text.strip() for e in elems[:3]]
+        if snapshot and len(snapshot.get('odds') or []) >= 3:
+            out['1'], out['X'], out['2'] = snapshot['odds'][:3]
+            logger.info(f"Odds: {out}")
+            return out
+        texts = []
+        if self.safe_find(*_ODDS, timeout=30):
+            texts = self._query_all(ScrapingConfig.ODDS_SELECTOR)
+        if len(texts) >= 3:
+            out['1'], out['X'], out['2'] = texts[:3]
             logger.info(f"Odds: {out}")
         return out
 
-    def _get_crowd_voting(self):
+    def _get_crowd_voting(self, snapshot=None):
         self.logger.info("Extracting crowd voting...")
+        voting = (snapshot or {}).get('crowd_voting')
+        if voting:
+            percents = voting.get('percents') or []
+            out = {"home": "N/A", "draw": "N/A", "away": "N/A", "total_votes": "N/A"}
+            if len(percents) >= 3:
+                out["home"], out["draw"], out["away"] = (self.extract_percentage(p) for p in percents[:3])
+            if voting.get('total_votes'):
+                out["total_votes"] = self.extract_total_votes(voting['total_votes'])
+            self.logger.info(f"Crowd voting: {out}")
+            return out
         try:
             home_pct = "N/A"
             draw_pct = "N/A"
             away_pct = "N/A"
             total_votes = "N/A"
 
-            voting_sections = self.driver.find_elements(
-                By.XPATH,
-                "//span[contains(text(), 'Who will win?')]/ancestor::div[contains(@class, 'bg_surface')]"
-            )
+            try:
+                voting_sections = WebDriverWait(self.driver, 5).until(
+                    EC.presence_of_all_elements_located(_CROWD_VOTING_SECTION))
+            except TimeoutException:
+                voting_sections = []
 
             if not voting_sections:
                 self.logger.warning("No crowd voting section found.")
@@ -469,18 +839,15 @@ class SofaScoreEPLScraper:
 
             block = voting_sections[0]
 
-            percent_elems = block.find_elements(By.CSS_SELECTOR, "div.Text.gHLcGU")
+            percent_elems = block.find_elements(*_VOTE_PERCENT)
             if len(percent_elems) >= 3:
                 home_pct = self.extract_percentage(percent_elems[0].text)
                 draw_pct = self.extract_percentage(percent_elems[1].text)
                 away_pct = self.extract_percentage(percent_elems[2].text)
 
-            vote_spans = block.find_elements(
-                By.XPATH,
-                ".//span[contains(text(), 'Total votes')]"
-            )
-            if vote_spans:
-                total_votes = self.extract_total_votes(vote_spans[0].text)
+            block_text = block.text
+            if "Total votes" in block_text:
+                total_votes = self.extract_total_votes(block_text)
 
             self.logger.info(
                 f"Crowd voting: home={home_pct}%, draw={draw_pct}%, away={away_pct}%, total_votes={total_votes}"
@@ -504,14 +871,11 @@ class SofaScoreEPLScraper:
 
     def _scroll_container(self, elt, max_scrolls=5):
         logger.debug("Scrolling stats container...")
-        last = self.driver.execute_script("return arguments[0].scrollHeight", elt)
-        for _ in range(max_scrolls):
-            self.driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", elt)
-            time.sleep(ScrapingConfig.SCROLL_PAUSE_TIME)
-            new = self.driver.execute_script("return arguments[0].scrollHeight", elt)
-            if new == last:
-                break
-            last = new
+        try:
+            scrolls = self.driver.execute_async_script(ScrapingConfig.SCROLL_CONTAINER_JS, elt, max_scrolls)
+            logger.debug(f"Stats container settled after {scrolls} scroll(s).")
+        except WebDriverException as e:
+            logger.warning(f"Could not scroll stats container: {e}")
 
     def _extract_stats_view(self):
         self.logger.info("Extracting stats view...")
@@ -519,16 +883,14 @@ class SofaScoreEPLScraper:
 
         self.logger.debug("Scrolling page to trigger lazy loading of stats container...")
         self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight / 2);")
-        time.sleep(1.5)
 
         cont = None
         for i in range(3):
-            cont = self.safe_find(By.CSS_SELECTOR, "div.Box.Flex.gQxTzO")
+            cont = self.safe_find(*_STATS_CONTAINER)
             if cont:
                 break
             self.logger.info(f"Stats container not found, retrying ({i+1}/3)...")
             self.driver.execute_script("window.scrollBy(0, 400);")
-            time.sleep(2)
 
         if cont:
             self._scroll_container(cont)
@@ -537,15 +899,17 @@ class SofaScoreEPLScraper:
 
         rows = []
         for i in range(3):
-            rows = self.safe_find_all(By.CSS_SELECTOR, "div.Box.Flex.heNsMA.bnpRyo", timeout=30)
+            rows = self.safe_find_all(*_STAT_ROW, timeout=30)
             if rows:
                 break
             self.logger.info(f"No stat rows found, retrying ({i+1}/3)...")
-            time.sleep(2)
 
         self.logger.debug(f"Found {len(rows)} stat rows.")
 
-        for r in rows:
+        if rows:
+            stats = self._batch_extract(('stats',)).get('stats') or []
+
+        for r in rows if not stats else []:
             try:
                 home_span = r.find_elements(By.CSS_SELECTOR, "bdi.Box.iQnHnj span.Text")
                 home_value = home_span[0].text.strip() if home_span else "N/A"
@@ -571,15 +935,18 @@ class SofaScoreEPLScraper:
 
     def wait_for_stat_rows(self, min_rows=10, timeout=20, poll_freq=0.5, return_rows=False):
         self.logger.debug(f"Waiting for at least {min_rows} stat rows...")
-        end_time = time.time() + timeout
-        while time.time() < end_time:
-            rows = self.safe_find_all(By.CSS_SELECTOR, "div.Box.Flex.heNsMA.bnpRyo")
-            if rows and len(rows) >= min_rows:
-                self.logger.debug(f"Found {len(rows)} stat rows.")
-                return rows if return_rows else True
-            time.sleep(poll_freq)
-        self.logger.warning(f"Timeout: Less than {min_rows} stat rows found.")
-        return [] if return_rows else False
+
+        def enough_rows(driver):
+            rows = driver.find_elements(*_STAT_ROW)
+            return rows if len(rows) >= min_rows else False
+
+        try:
+            rows = WebDriverWait(self.driver, timeout, poll_frequency=poll_freq).until(enough_rows)
+        except TimeoutException:
+            self.logger.warning(f"Timeout: Less than {min_rows} stat rows found.")
+            return [] if return_rows else False
+        self.logger.debug(f"Found {len(rows)} stat rows.")
+        return rows if return_rows else True
 
     def _get_stats(self):
         self.logger.info("Extracting all statistics sections...")
@@ -592,14 +959,19 @@ class SofaScoreEPLScraper:
         # Extract overall stats
         out["overall"] = self._extract_stats_view()
 
+        # Matches without half stats have no such tabs; don't wait out retries on them.
+        available = set(self._query_all("div[data-tabid]", "data-tabid"))
+
         def extract_with_retries(tab_id, label):
+            if str(tab_id) not in available:
+                self.logger.info(f"No {label} stats tab on this page.")
+                return []
             for attempt in range(3):
                 self.logger.info(f"Attempt {attempt + 1} to extract {label} stats...")
-                tab = self.safe_find(By.CSS_SELECTOR, f"div[data-tabid='{tab_id}']")
-                if tab and self.safe_click(tab):
+                tabs = self.driver.find_elements(*_stats_tab(tab_id))
+                if tabs and self.safe_click(tabs[0]):
                     if self.wait_for_stat_rows(min_rows=10):
                         return self._extract_stats_view()
-                time.sleep(2)
             self.logger.warning(f"Failed to extract {label} stats after 3 attempts.")
             return []
 
@@ -612,31 +984,16 @@ class SofaScoreEPLScraper:
     # --- Generic Data Extraction Helpers (for specific data points from text) ---
     def extract_card_stats_from_text(self, text):
         """Extract red and yellow card averages from text"""
-        import re
         try:
-            card_pattern = r'Avg\.\s*cards.?(\d+\.?\d)[^\d](\d+\.?\d)'
-            match = re.search(card_pattern, text, re.IGNORECASE | re.DOTALL)
-            
-            if match:
-                red_cards = float(match.group(1))
-                yellow_cards = float(match.group(2))
-                return red_cards, yellow_cards
-
-            numbers = re.findall(r'\d+\.\d+', text)
-            if len(numbers) >= 2:
-                return float(numbers[0]), float(numbers[1])
-                
+            return parse_card_stats(text)
         except Exception as e:
             self.logger.debug(f"Error extracting card stats: {e}")
-        
         return None, None
 
     def extract_percentage(self, text):
         """Extract percentage from text like '83%'"""
-        import re
         try:
-            match = re.search(r'(\d+)%', text)
-            return int(match.group(1)) if match else "N/A"
+            return parse_percentage(text)
         except:
             return "N/A"
 
@@ -645,19 +1002,8 @@ class SofaScoreEPLScraper:
         Extracts the number of votes from strings like:
         'Total votes: 12,345' or 'Total votes: 121k'
         """
-        import re
         try:
-            m = re.search(r"Total votes[:\s]*([\d.,]+)([kM]?)", text, re.IGNORECASE)
-            if m:
-                number = m.group(1).replace(",", "")
-                suffix = m.group(2).lower()
-
-                if suffix == 'k':
-                    return str(int(float(number) * 1000))
-                elif suffix == 'm':
-                    return str(int(float(number) * 1_000_000))
-                else:
-                    return number
+            return parse_total_votes(text)
         except Exception as e:
             self.logger.warning(f"Failed to extract total votes: {e}")
         return "N/A"
@@ -668,38 +1014,11 @@ class SofaScoreEPLScraper:
         Classify commentary text into a type based on keywords.
         """
         lowered = text.lower()
-        if "goal" in lowered:
-            return "goal"
-        elif "substitution" in lowered or "subbed" in lowered or "substituted" in lowered:
-            return "substitution"
-        elif "yellow card" in lowered or "booked" in lowered:
-            return "yellow_card"
-        elif "red card" in lowered or "sent off" in lowered:
-            return "red_card"
-        elif "corner" in lowered:
-            return "corner"
-        elif "foul" in lowered:
-            return "foul"
-        elif "offside" in lowered:
-            return "offside"
-        elif "penalty" in lowered:
-            return "penalty"
-        elif "attempt" in lowered or "shot" in lowered:
-            return "attempt"
-        elif "free kick" in lowered:
-            return "free_kick"
-        elif "kick-off" in lowered or "kick off" in lowered:
-            return "kick_off"
-        elif "half time" in lowered or "half-time" in lowered:
-            return "half_time"
-        elif "full time" in lowered or "full-time" in lowered:
-            return "full_time"
-        elif "var" in lowered:
-            return "var"
-        elif "injury" in lowered:
-            return "injury"
+        if _EVENT_AUTOMATON is not None:
+            hits = [rank for _, rank in _EVENT_AUTOMATON.iter(lowered)]
         else:
-            return "other"
+            hits = [_EVENT_RANKS[m.group(1)] for m in _EVENT_RE.finditer(lowered)]
+        return min(hits)[1] if hits else "other"
 
     def navigate_to_commentary_section(self):
         """Navigate to the commentary section of the match"""
@@ -707,28 +1026,28 @@ class SofaScoreEPLScraper:
         
         try:
             # Try to find and click commentary tab/section
-            commentary_selectors = [
-                "//span[contains(text(), 'Commentary')]",
-                "//a[contains(text(), 'Commentary')]",
-                "//button[contains(text(), 'Commentary')]",
-                "div[data-tabid='commentary']",
-                "a[href*='commentary']"
-            ]
-            
-            for selector in commentary_selectors:
+            def any_tab_present(driver):
+                return any(driver.find_elements(*locator) for locator in _COMMENTARY_TABS)
+
+            try:
+                WebDriverWait(self.driver, 5).until(any_tab_present)
+            except TimeoutException:
+                self.logger.debug("No commentary tab rendered within 5s.")
+
+            for locator in _COMMENTARY_TABS:
                 try:
-                    if selector.startswith("//"):
-                        elements = self.driver.find_elements(By.XPATH, selector)
-                    else:
-                        elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    
+                    elements = self.driver.find_elements(*locator)
                     if elements:
                         self.safe_click(elements[0])
-                        time.sleep(2)  # Wait for content to load
+                        try:
+                            WebDriverWait(self.driver, 5).until(EC.presence_of_element_located(
+                                _COMMENTARY_ENTRY))
+                        except TimeoutException:
+                            self.logger.debug("Commentary entries not rendered yet.")
                         self.logger.info("Successfully navigated to commentary section")
                         return True
                 except Exception as e:
-                    self.logger.debug(f"Failed to click commentary selector {selector}: {e}")
+                    self.logger.debug(f"Failed to click commentary selector {locator[1]}: {e}")
                     continue
             
             self.logger.warning("Could not find commentary section")
@@ -738,11 +1057,30 @@ class SofaScoreEPLScraper:
             self.logger.warning(f"Error navigating to commentary section: {e}")
             return False
 
+    def _get_commentary_api(self):
+        """Commentary from the JSON API the page itself renders from; [] if unavailable."""
+        mid = _MATCH_ID_RE.search(self.driver.current_url)
+        if not mid:
+            return []
+        try:
+            comments = self.api.commentary(mid.group(1))
+        except (APIUnavailable, httpx.HTTPError) as e:
+            self.logger.warning(f"API commentary unavailable, reading it from the page: {e}")
+            return []
+        unique = {}
+        for c in comments:
+            unique.setdefault(c["text"], {"time": c["time"], "text": c["text"], "type": self.classify_event_type(c["text"])})
+        return list(unique.values())
+
     def _get_commentary(self):
         """Extract full commentary with improved error handling and multiple selector approaches"""
         self.logger.info("Extracting full commentary...")
-        commentary = []
-        seen_texts = set()
+
+        if self.config.USE_API:
+            commentary = self._get_commentary_api()
+            if commentary:
+                self.logger.info(f"Fetched {len(commentary)} commentary entries via API")
+                return commentary
 
         try:
             # First, try to navigate to commentary section
@@ -753,37 +1091,21 @@ class SofaScoreEPLScraper:
             max_clicks = 25  # Increased max clicks
             attempts = 0
             consecutive_no_change = 0
-            previous_count = 0
+            previous_count = self._count_commentary_entries()
 
             while attempts < max_clicks and consecutive_no_change < 3:
-                show_more_found = False
-                
-                # Try multiple selectors for "Show more" button
-                for selector in self.config.LOAD_MORE_SELECTORS:
-                    try:
-                        if selector.startswith("//"):
-                            show_more_elements = self.driver.find_elements(By.XPATH, selector)
-                        else:
-                            show_more_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        
-                        if show_more_elements:
-                            show_more = show_more_elements[0]
-                            if show_more.is_displayed() and show_more.is_enabled():
-                                if self.safe_click(show_more):
-                                    show_more_found = True
-                                    time.sleep(1.5)  # Wait for content to load
-                                    break
-                    except Exception as e:
-                        self.logger.debug(f"Error with selector {selector}: {e}")
-                        continue
+                show_more_found = self._click_load_more()
+                if show_more_found:
+                    self._wait_for_more_commentary(previous_count)
 
                 if not show_more_found:
+                    # Layouts without the button lazy-load entries on scroll instead
                     self.logger.info("No more 'Show more' buttons found")
+                    self._scroll_to_bottom()
                     break
 
                 # Check if new content was loaded
-                containers = self.get_commentary_containers()
-                current_count = len(containers)
+                current_count = self._count_commentary_entries()
                 
                 if current_count == previous_count:
                     consecutive_no_change += 1
@@ -796,18 +1118,13 @@ class SofaScoreEPLScraper:
                 attempts += 1
 
             # Step 2: Extract commentary entries
-            containers = self.get_commentary_containers()
-            self.logger.info(f"Found {len(containers)} commentary containers")
-
-            for i, entry in enumerate(containers):
-                try:
-                    entry_data = self._get_commentary_entry(entry)
-                    if entry_data and entry_data["text"] not in seen_texts:
-                        seen_texts.add(entry_data["text"])
-                        commentary.append(entry_data)
-                        
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse commentary entry {i}: {e}")
+            # Keyed on text: the first entry per text wins and keeps its position
+            unique = {}
+            for batch in self.iter_commentary():
+                for entry_data in batch:
+                    if entry_data:
+                        unique.setdefault(entry_data["text"], entry_data)
+            commentary = list(unique.values())
 
             self.logger.info(f"Successfully extracted {len(commentary)} commentary entries")
             return commentary
@@ -816,63 +1133,171 @@ class SofaScoreEPLScraper:
             self.logger.error(f"Failed to extract commentary: {e}")
             return []
 
+    def _click_load_more(self):
+        """Clicks the first visible "Show more" button; True if one was clicked."""
+        try:
+            clicked = self.driver.execute_script(
+                self.config.LOAD_MORE_CLICK_JS, self.config.LOAD_MORE_SELECTORS, self.config.LOAD_MORE_TEXT_PATTERN)
+            if clicked:
+                self.logger.debug(f"Clicked load-more control: {clicked}")
+            return bool(clicked)
+        except WebDriverException as e:
+            self.logger.debug(f"In-page load-more click failed, trying selectors one by one: {e}")
+
+        # Try multiple selectors for "Show more" button
+        for locator in _LOAD_MORE:
+            try:
+                show_more_elements = self.driver.find_elements(*locator)
+                if show_more_elements:
+                    show_more = show_more_elements[0]
+                    if show_more.is_displayed() and show_more.is_enabled():
+                        if self.safe_click(show_more):
+                            return True
+            except Exception as e:
+                self.logger.debug(f"Error with selector {locator[1]}: {e}")
+                continue
+        return False
+
+    def _scroll_to_bottom(self, max_scrolls=25):
+        """Scrolls the page down in-page until its height stops growing; returns the scroll count."""
+        try:
+            # A null element makes the snippet scroll the document itself
+            scrolls = self.driver.execute_async_script(self.config.SCROLL_CONTAINER_JS, None, max_scrolls)
+            self.logger.debug(f"Page settled after {scrolls} lazy-load scroll(s).")
+            return scrolls
+        except WebDriverException as e:
+            self.logger.debug(f"Could not scroll page to the bottom: {e}")
+            return 0
+
+    def _wait_for_more_commentary(self, previous_count):
+        """Returns as soon as the DOM grows past previous_count, or after LOAD_MORE_WAIT_MS."""
+        try:
+            return self.driver.execute_async_script(
+                self.config.WAIT_FOR_MORE_JS, self.config.COMMENTARY_ENTRY_CONTAINER,
+                previous_count, self.config.LOAD_MORE_WAIT_MS,
+            )
+        except WebDriverException as e:
+            self.logger.debug(f"Could not observe commentary growth, sleeping instead: {e}")
+            time.sleep(self.config.LOAD_MORE_WAIT_MS / 2000)
+            return False
+
+    def _count_commentary_entries(self):
+        """Entry count read in-page; only the fallback layouts need the element lookup."""
+        try:
+            count = self.driver.execute_script(
+                "return document.querySelectorAll(arguments[0]).length;", self.config.COMMENTARY_ENTRY_CONTAINER)
+        except WebDriverException as e:
+            self.logger.debug(f"Could not count commentary entries in-page: {e}")
+            count = 0
+        return count or len(self.get_commentary_containers())
+
+    def _read_commentary_entries(self, containers):
+        """Parses all entries in one execute_script, or element by element if that fails."""
+        if not containers:
+            return []
+        try:
+            raw = self.driver.execute_script(
+                self.config.COMMENTARY_EXTRACT_JS, containers,
+                self.config.COMMENTARY_TIME_SELECTORS, self.config.COMMENTARY_TEXT_SELECTORS,
+            )
+        except WebDriverException as e:
+            self.logger.warning(f"In-page commentary extraction failed: {e}")
+            raw = self._parse_page_commentary()
+            if raw is None:
+                self.logger.info("Reading commentary entries one by one.")
+                return [self._get_commentary_entry(entry) for entry in containers]
+        return self._typed_entries(raw)
+
+    def _typed_entries(self, raw):
+        return [
+            {"time": e["time"], "text": e["text"], "type": self.classify_event_type(e["text"])}
+            for e in raw if e.get("text") and e["text"] != "N/A"
+        ]
+
+    def iter_commentary(self, chunk=200):
+        """Yields parsed commentary entries in batches of at most `chunk`.
+
+        Each batch is found and read in-page, so only plain dicts cross the
+        wire and at most one batch is held at a time. Falls back to reading
+        every container at once if the page script fails.
+        """
+        start = 0
+        while True:
+            try:
+                raw = self.driver.execute_script(
+                    self.config.COMMENTARY_CHUNK_JS, self.config.COMMENTARY_ENTRY_CONTAINER,
+                    self.config.COMMENTARY_ALT_CONTAINERS, self.config.COMMENTARY_KEYWORDS,
+                    self.config.COMMENTARY_TIME_SELECTORS, self.config.COMMENTARY_TEXT_SELECTORS,
+                    start, chunk,
+                ) or []
+            except WebDriverException as e:
+                self.logger.warning(f"Chunked commentary read failed at entry {start}: {e}")
+                # Entries already yielded come round again; callers dedup on text
+                yield self._read_commentary_entries(self.get_commentary_containers())
+                return
+            if raw:
+                yield self._typed_entries(raw)
+            if len(raw) < chunk:
+                return
+            start += chunk
+
+    def _parse_page_commentary(self):
+        """Parses commentary from one page_source fetch with lxml; None if lxml is missing."""
+        if CSSSelector is None:
+            return None
+        try:
+            return _parse_commentary_html(self.driver.page_source)
+        except (WebDriverException, ValueError) as e:
+            self.logger.warning(f"Could not parse commentary from page source: {e}")
+            return None
+
     def get_commentary_containers(self):
         """Get all commentary containers using multiple selector approaches"""
+        try:
+            return self.driver.execute_script(
+                self.config.COMMENTARY_CONTAINERS_JS, self.config.COMMENTARY_ENTRY_CONTAINER,
+                self.config.COMMENTARY_ALT_CONTAINERS, self.config.COMMENTARY_KEYWORDS,
+            ) or []
+        except WebDriverException as e:
+            self.logger.debug(f"In-page container lookup failed, querying selectors one by one: {e}")
+
+        # find_elements returns [] on a miss, so only a broken session raises here
         containers = []
-        
-        # Try primary selector
         try:
-            containers = self.driver.find_elements(By.CSS_SELECTOR, self.config.COMMENTARY_ENTRY_CONTAINER)
+            # Try primary selector
+            containers = self.driver.find_elements(*_COMMENTARY_ENTRY)
             if containers:
                 return containers
-        except:
-            pass
-        
-        # Try alternative selectors
-        alternative_selectors = [
-            "div[class*='commentary-entry']",
-            "div[class*='event-entry']", 
-            "div[class*='match-event']",
-            "div.d_flex.ai_center",
-            "div[class*='timeline-entry']"
-        ]
-        
-        for selector in alternative_selectors:
-            try:
+
+            # Try alternative selectors, keeping only elements that look like commentary
+            for selector in self.config.COMMENTARY_ALT_CONTAINERS:
                 containers = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if containers:
-                    # Filter to only include elements that look like commentary
-                    filtered_containers = []
-                    for container in containers:
-                        if self.looks_like_commentary(container):
-                            filtered_containers.append(container)
-                    
-                    if filtered_containers:
-                        return filtered_containers
-            except:
-                continue
-        
+                filtered_containers = [c for c in containers if self.looks_like_commentary(c)]
+                if filtered_containers:
+                    return filtered_containers
+        except WebDriverException as e:
+            self.logger.debug(f"Commentary container lookup failed: {e}")
         return containers
 
     def looks_like_commentary(self, element):
         """Check if an element looks like a commentary entry"""
         try:
-            text = element.text.strip()
-            # Commentary entries typically have some text and might contain time stamps
-            return (len(text) > 5 and 
-                (any(char.isdigit() for char in text) or
-                any(keyword in text.lower() for keyword in ['goal', 'card', 'corner', 'foul', 'attempt'])))
+            return _looks_like_commentary_text(element.text.strip())
         except:
             return False
 
-    def _get_commentary_entry(self, entry):
+    def _get_commentary_entry(self, entry, cached_text=None):
         """Extract time and text from a single commentary entry"""
         try:
+            # Both fallbacks need the entry's full text; read it once
+            if cached_text is None:
+                cached_text = entry.text
+
             # Extract time using multiple approaches
-            time_text = self.extract_time_from_entry(entry)
+            time_text = self.extract_time_from_entry(entry, cached_text)
             
             # Extract commentary text using multiple approaches  
-            commentary_text = self.extract_text_from_entry(entry)
+            commentary_text = self.extract_text_from_entry(entry, cached_text)
             
             if commentary_text and commentary_text != "N/A":
                 event_type = self.classify_event_type(commentary_text)
@@ -887,31 +1312,29 @@ class SofaScoreEPLScraper:
         
         return None
 
-    def extract_time_from_entry(self, entry):
+    @staticmethod
+    def _first_match(ctx, selectors, ok):
+        """Stripped text of the first element under ctx, in selector priority
+        order, whose text passes ok; None if no selector yields one."""
+        for selector in selectors:
+            elements = ctx.find_elements(By.CSS_SELECTOR, selector)
+            if elements:
+                text = elements[0].text.strip()
+                if ok(text):
+                    return text
+        return None
+
+    def extract_time_from_entry(self, entry, cached_text=None):
         """Extract time from commentary entry using multiple selectors"""
-        time_selectors = [
-            "span.textStyle_assistive.default",
-            "span[class*='time']",
-            "span[class*='minute']", 
-            "div[class*='time']",
-            ".time",
-            ".minute"
-        ]
-        
-        for selector in time_selectors:
-            try:
-                time_elements = entry.find_elements(By.CSS_SELECTOR, selector)
-                if time_elements:
-                    time_text = time_elements[0].text.strip()
-                    if time_text and "'" in time_text:  # Looks like a time stamp
-                        return time_text
-            except:
-                continue
-        
+        # Looks like a time stamp
+        time_text = self._first_match(entry, self.config.COMMENTARY_TIME_SELECTORS, lambda t: "'" in t)
+        if time_text:
+            return time_text
+
         # Look for time patterns in the text
         try:
-            entry_text = entry.text
-            time_match = re.search(r"(\d{1,3}(?:\+\d+)?)'", entry_text)
+            entry_text = cached_text if cached_text is not None else entry.text
+            time_match = _MINUTE_RE.search(entry_text)
             if time_match:
                 return time_match.group(1) + "'"
         except:
@@ -919,33 +1342,19 @@ class SofaScoreEPLScraper:
         
         return "N/A"
 
-    def extract_text_from_entry(self, entry):
+    def extract_text_from_entry(self, entry, cached_text=None):
         """Extract commentary text from entry using multiple selectors"""
-        text_selectors = [
-            "span.textStyle_body.small",
-            "span[class*='text']",
-            "div[class*='description']",
-            "span[class*='body']",
-            ".text",
-            ".description"
-        ]
-        
-        for selector in text_selectors:
-            try:
-                text_elements = entry.find_elements(By.CSS_SELECTOR, selector)
-                if text_elements:
-                    text = text_elements[0].text.strip()
-                    if text and len(text) > 3:  # Reasonable text length
-                        return text
-            except:
-                continue
-        
+        # Reasonable text length
+        text = self._first_match(entry, self.config.COMMENTARY_TEXT_SELECTORS, lambda t: len(t) > 3)
+        if text:
+            return text
+
         # Fallback to full entry text, but clean it up
         try:
-            full_text = entry.text.strip()
+            full_text = (cached_text if cached_text is not None else entry.text).strip()
             if full_text:
                 # Remove time stamps from beginning
-                clean_text = re.sub(r"^\d{1,3}(?:\+\d+)?'\s*", "", full_text)
+                clean_text = _LEADING_MINUTE_RE.sub("", full_text)
                 return clean_text if clean_text else full_text
         except:
             pass
@@ -0,0 +1,66 @@
+# epl_scraper/throttle.py
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket shared by all worker threads.
+
+    Workers only block when the pool as a whole is ahead of quota, so
+    politeness towards the site is kept without serializing the scrape.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures across all workers.
+
+    While open, callers wait out one shared cooldown instead of each match
+    paying its own retry delays against a site that is down or rate-limiting.
+    """
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+        self.lock = threading.Lock()
+
+    def wait_if_open(self):
+        with self.lock:
+            wait = self.open_until - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+
+    def record_failure(self):
+        """Returns True if this failure tripped the breaker."""
+        with self.lock:
+            self.failures += 1
+            if self.failures < self.threshold:
+                return False
+            self.failures = 0
+            self.open_until = time.monotonic() + self.cooldown
+            return True